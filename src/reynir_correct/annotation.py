@@ -34,16 +34,30 @@
 
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 class Annotation:
 
     """An annotation of a span of a token list for a sentence"""
 
+    # Annotations are created in large numbers, so we avoid
+    # a per-instance __dict__
+    __slots__ = (
+        "_start",
+        "_end",
+        "_code",
+        "_text",
+        "_detail",
+        "_suggest",
+        "_original",
+        "_suggestlist",
+        "_references",
+        "_str",
+    )
+
     def __init__(
         self,
-        *,
         start: int,
         end: int,
         code: str,
@@ -78,21 +92,27 @@ class Annotation:
         self._original = original
         self._suggestlist = suggestlist
         self._references = references
+        # Cached string representation, created on demand
+        self._str: Optional[str] = None
 
     def __str__(self) -> str:
         """Return a string representation of this annotation"""
-        if self._original and self._suggest:
-            orig_sugg = f" | '{self._original}' -> '{self._suggest}'"
-        else:
-            orig_sugg = ""
-        return "{0:03}-{1:03}: {2:6} {3}{4} | {5}".format(
-            self._start,
-            self._end,
-            self._code,
-            self._text,
-            orig_sugg,
-            self._suggestlist,
-        )
+        # The annotation does not change after construction,
+        # so the string representation is only formatted once
+        if self._str is None:
+            if self._original and self._suggest:
+                orig_sugg = f" | '{self._original}' -> '{self._suggest}'"
+            else:
+                orig_sugg = ""
+            self._str = "{0:03}-{1:03}: {2:6} {3}{4} | {5}".format(
+                self._start,
+                self._end,
+                self._code,
+                self._text,
+                orig_sugg,
+                self._suggestlist,
+            )
+        return self._str
 
     @property
     def start(self) -> int:
@@ -104,6 +124,12 @@ class Annotation:
         """The index of the last token to which the annotation applies"""
         return self._end
 
+    @property
+    def sort_key(self) -> Tuple[int, int]:
+        """A key for ordering annotations by start index
+        and then by decreasing span length"""
+        return (self._start, -self._end)
+
     @property
     def code(self) -> str:
         """A code for the annotation type, usually an error or warning code"""
@@ -50,14 +50,17 @@
 
 """
 
-from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, cast
-from typing_extensions import TypedDict
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, cast
 
 import importlib.util
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from importlib.abc import Loader
 from importlib.machinery import ModuleSpec
+from operator import attrgetter
 from threading import Lock
 from types import ModuleType
 
@@ -69,7 +72,7 @@ from reynir.fastparser import ffi  # type: ignore
 from reynir.fastparser import Fast_Parser
 from reynir.incparser import ICELANDIC_RATIO
 from reynir.reducer import Reducer
-from reynir.reynir import Job, ProgressFunc
+from reynir.reynir import Job, Paragraph, ProgressFunc
 from tokenizer import Abbreviations, Tok
 
 from reynir_correct.settings import Settings
@@ -142,8 +145,33 @@ class AnnotatedSentence(Sentence):
         self.correct_tokens: List[CorrectToken] = cast(List[CorrectToken], self.tokens)
 
 
-# The type of a grammar check result
-class CheckResult(TypedDict):
+class _ThreadSafeJob(_Job):
+    """A parse job whose sentences can be parsed in several threads at once.
+    The job statistics are updated, and the progress function called,
+    for one sentence at a time."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = Lock()
+
+    def _add_sentence(self, s: TokenList, num: int, parse_time: float, reduce_time: float) -> None:
+        with self._stats_lock:
+            super()._add_sentence(s, num, parse_time, reduce_time)
+
+
+def _parse_paragraph(pg: Paragraph) -> List[AnnotatedSentence]:
+    """Return the sentences of a paragraph, which are parsed as they are created"""
+    return [cast(AnnotatedSentence, sent) for sent in pg]
+
+
+@dataclass
+class CheckResult:
+    """The result of a grammar check"""
+
+    # Slots are declared explicitly rather than via dataclass(slots=True),
+    # which requires Python 3.10
+    __slots__ = ("sentences", "num_sentences", "num_parsed", "num_tokens", "ambiguity", "parse_time")
+
     sentences: List[AnnotatedSentence]
     num_sentences: int
     num_parsed: int
@@ -151,6 +179,18 @@ class CheckResult(TypedDict):
     ambiguity: float
     parse_time: float
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a dictionary, as previously returned
+        from GreynirCorrect.parse_all_tokens()"""
+        return dict(
+            sentences=self.sentences,
+            num_sentences=self.num_sentences,
+            num_parsed=self.num_parsed,
+            num_tokens=self.num_tokens,
+            ambiguity=self.ambiguity,
+            parse_time=self.parse_time,
+        )
+
 
 class ErrorDetectingParser(Fast_Parser):
 
@@ -186,16 +226,36 @@ class GreynirCorrect(Greynir):
     _parser: Optional[ErrorDetectingParser] = None
     _reducer = None
     _lock = Lock()
+    # Monotonic time of the last check for a modified grammar file,
+    # and the minimum interval in seconds between such checks
+    _last_check: float = 0.0
+    _GRAMMAR_CHECK_INTERVAL = 1.0
+
+    # Maximum number of entries in the suggestion match cache
+    _MATCH_CACHE_SIZE = 4096
 
     def __init__(
         self,
         settings: Settings,
         pipeline: CorrectionPipeline,
+        *,
+        memoize_suggestions: bool = False,
         **options: Any,
     ) -> None:
         super().__init__(**options)
         self.settings = settings
         self.pipeline = pipeline
+        # Optional cache of suggestion_does_not_match() results, keyed by
+        # terminal and token signature. This only pays off when the same
+        # suggestions recur, as in long documents, and is therefore opt-in.
+        self._match_cache: Optional[Dict[Tuple[Any, ...], bool]] = {} if memoize_suggestions else None
+        # The grammar instance that the cached results were computed with
+        self._match_cache_grammar: Optional[BIN_Grammar] = None
+        # The union of the pattern matcher's trigger lemmas, or None if
+        # some pattern has no trigger. This is collected from the first
+        # pattern matcher that is created.
+        self._pattern_triggers: Optional[FrozenSet[str]] = None
+        self._pattern_triggers_known = False
 
     def tokenize(self, text: StringIterable) -> Iterator[Tok]:
         """Use the correcting tokenizer instead of the normal one"""
@@ -223,13 +283,32 @@ class GreynirCorrect(Greynir):
     @property
     def parser(self) -> Fast_Parser:
         """Override the parent class' construction of a parser instance"""
+        p = GreynirCorrect._parser
+        if p is not None:
+            # Fast path, without locking: reading and assigning the
+            # class attribute is atomic, and the lock is only needed
+            # when the parser must be (re)created
+            now = time.monotonic()
+            if now - GreynirCorrect._last_check < self._GRAMMAR_CHECK_INTERVAL:
+                # The grammar file was checked recently
+                return p
+            GreynirCorrect._last_check = now
+            if not p.is_grammar_modified()[0]:
+                return p
         with self._lock:
-            if GreynirCorrect._parser is None or GreynirCorrect._parser.is_grammar_modified()[0]:
+            # Check again, since another thread may have created
+            # the parser while we were waiting for the lock
+            p = GreynirCorrect._parser
+            if p is None or p.is_grammar_modified()[0]:
                 # Initialize a singleton instance of the parser and the reducer.
                 # Both classes are re-entrant and thread safe.
-                GreynirCorrect._parser = edp = ErrorDetectingParser()
-                GreynirCorrect._reducer = Reducer(edp.grammar)
-            return GreynirCorrect._parser
+                # The reducer is assigned first, since the fast path above
+                # may return the parser as soon as it has been assigned.
+                p = ErrorDetectingParser()
+                GreynirCorrect._reducer = Reducer(p.grammar)
+                GreynirCorrect._parser = p
+                GreynirCorrect._last_check = time.monotonic()
+            return p
 
     @property
     def reducer(self) -> Reducer:
@@ -238,120 +317,172 @@ class GreynirCorrect(Greynir):
         assert GreynirCorrect._reducer is not None
         return GreynirCorrect._reducer
 
+    def _may_match_patterns(self, sent: Sentence) -> bool:
+        """Return True if any of the pattern trigger lemmas
+        occur in the sentence, or if there are untriggered patterns"""
+        triggers = self._pattern_triggers
+        if triggers is None:
+            return True
+        return not triggers.isdisjoint(PatternMatcher.sentence_lemmas(sent))
+
+    def _suggestion_does_not_match(self, t: CorrectToken, ix: int, terminal: VariantHandler) -> bool:
+        """Return True if the spelling suggestion associated with token t
+        does not work grammatically with the given terminal, consulting
+        the match cache if memoization is enabled"""
+        if not hasattr(t.error, "does_not_match"):
+            # Only errors carrying a spelling suggestion can fail to match,
+            # so there is no need to wrap the token for the others
+            return False
+        cache = self._match_cache
+        val = t.val
+        if cache is None or not isinstance(val, list):
+            # For the call to suggestion_does_not_match(), we need a
+            # BIN_Token instance, which we obtain in a bit of a hacky
+            # way by creating it on the fly. Only tokens with a list
+            # of meanings are memoized.
+            return t.suggestion_does_not_match(terminal, BIN_Parser.wrap_token(t, ix))
+        # The verdict also depends on the token's meanings, which are looked up
+        # with regard to the token's position in the sentence (at the start or
+        # not), and on the error's suggestion list, so both are part of the key
+        suggestlist = getattr(t.error, "suggestlist", None)
+        key = (
+            id(terminal),
+            t.kind,
+            t.txt,
+            t.error_code,
+            t.error_original,
+            t.error_suggest,
+            tuple(val),
+            tuple(suggestlist) if suggestlist else None,
+        )
+        result = cache.get(key)
+        if result is None:
+            if len(cache) >= self._MATCH_CACHE_SIZE:
+                cache.clear()
+            result = cache[key] = t.suggestion_does_not_match(terminal, BIN_Parser.wrap_token(t, ix))
+        return result
+
     def annotate(self, sent: Sentence) -> List[Annotation]:
         """Returns a list of annotations for a sentence object, containing
         spelling and grammar annotations of that sentence"""
         ann: List[Annotation] = []
         parsed = sent.deep_tree is not None
-        # Create a mapping from token indices to terminal indices.
-        # This is necessary because not all tokens are included in
-        # the token list that is passed to the parser, and therefore
-        # the terminal-token matches can be fewer than the original tokens.
-        token_to_terminal: Dict[int, int] = {}
-        if parsed:
-            token_to_terminal = {
-                tnode.index: ix for ix, tnode in enumerate(sent.terminal_nodes) if tnode.index is not None
-            }
         grammar = self.parser.grammar
-        # First, add token-level annotations and count words that occur in BÍN
+        if self._match_cache is not None and grammar is not self._match_cache_grammar:
+            # The grammar has been (re)loaded since the cached
+            # results were computed: its terminals are new objects
+            self._match_cache.clear()
+            self._match_cache_grammar = grammar
+        # Create a mapping from token indices to the original BIN_Terminal
+        # instances from the grammar. This is necessary because not all
+        # tokens are included in the token list that is passed to the parser,
+        # and therefore the terminal-token matches can be fewer than the
+        # original tokens. A token that matched a terminal which isn't found
+        # in grammar.terminals is mapped to None; at least one case,
+        # finna→Finna, gets the terminal "person_kvk" which isn't there!
+        terminal_by_tok_ix: Dict[int, Optional[VariantHandler]] = {}
+        if parsed:
+            terminals = grammar.terminals
+            # A terminal node without an original terminal is mapped to None
+            # without a lookup, and its token is skipped as for a missing one
+            terminal_by_tok_ix = cast(
+                Dict[int, Optional[VariantHandler]],
+                {
+                    index: None if (orig := tnode.original_terminal) is None else terminals.get(orig)
+                    for tnode in sent.terminal_nodes
+                    if (index := tnode.index) is not None
+                },
+            )
+        tokens = sent.tokens
+        # Pre-scan the token list once into parallel arrays of token kinds
+        # and error codes, so that each of the passes below only looks at
+        # the tokens that concern it.
+        # Note: these tokens and indices are the original tokens from
+        # the submitted text, including ones that are not understood
+        # by the parser, such as quotation marks and exotic punctuation
+        kinds: List[int] = [t.kind for t in tokens]
+        # Tokens that are not CorrectToken instances (or duck typing
+        # equivalents) have an empty error code
+        error_codes: List[str] = [getattr(t, "error_code", "") for t in tokens]
+        ec_indices = [ix for ix, code in enumerate(error_codes) if code]
+        # First, count words that occur in BÍN, in a single pass.
+        # The token kinds are bound to locals to avoid repeated global lookups
+        tok_word, tok_person, tok_entity = TOK.WORD, TOK.PERSON, TOK.ENTITY
         words_in_bin = 0
         words_not_in_bin = 0
-        for ix, t in enumerate(sent.tokens):
-            if t.kind == TOK.WORD:
+        for kind, t in zip(kinds, tokens):
+            if kind == tok_word:
                 if t.has_meanings:
                     # The word has at least one meaning
                     words_in_bin += 1
                 else:
                     # The word has no recognized meaning
                     words_not_in_bin += 1
-            elif t.kind == TOK.PERSON:
+            elif kind == tok_person:
                 # Person names count as recognized words
                 words_in_bin += 1
-            elif t.kind == TOK.ENTITY:
+            elif kind == tok_entity:
                 # Entity names do not count as recognized words;
                 # we count each enclosed word in the entity name
                 words_not_in_bin += t.txt.count(" ") + 1
-            # Note: these tokens and indices are the original tokens from
-            # the submitted text, including ones that are not understood
-            # by the parser, such as quotation marks and exotic punctuation
-            annotate = False
-            if getattr(t, "error_code", "") != "":
-                # This is a CorrectToken instance (or a duck typing equivalent)
-                assert isinstance(t, CorrectToken)  # Satisfy Mypy
-                annotate = True
-                if parsed and ix in token_to_terminal:
-                    # For the call to suggestion_does_not_match(), we need a
-                    # BIN_Token instance, which we obtain in a bit of a hacky
-                    # way by creating it on the fly
-                    bin_token = BIN_Parser.wrap_token(t, ix)
-                    # Obtain the original BIN_Terminal instance from the grammar
-                    terminal_index = token_to_terminal[ix]
-                    terminal_node = sent.terminal_nodes[terminal_index]
-                    original_terminal = terminal_node.original_terminal
-                    if original_terminal not in grammar.terminals:
-                        # At least one case, finna→Finna, gets the terminal "person_kvk"
-                        # which isn't found in grammar.terminals!
-                        annotate = False
-                        continue
-                    assert original_terminal is not None
-                    terminal = grammar.terminals[original_terminal]
-                    assert isinstance(terminal, VariantHandler)
-                    if t.suggestion_does_not_match(terminal, bin_token):
-                        # If this token is annotated with a spelling suggestion,
-                        # do not add it unless it works grammatically
-                        annotate = False
-                if annotate:
-                    a = Annotation(
-                        start=ix,
-                        end=ix + t.error_span - 1,
-                        code=t.error_code,
-                        text=t.error_description,
-                        detail=t.error_detail,
-                        references=t.error_references,
-                        original=t.error_original,
-                        suggest=t.error_suggest,
-                    )
-                    ann.append(a)
-            elif t.txt in Abbreviations.DICT:
+        append = ann.append
+        abbreviations = Abbreviations.DICT
+        # Then, add token-level annotations for tokens with error codes
+        for ix in ec_indices:
+            # A token with an error code is a CorrectToken instance
+            # (or a duck typing equivalent)
+            ct = cast(CorrectToken, tokens[ix])
+            if ix in terminal_by_tok_ix:
+                terminal = terminal_by_tok_ix[ix]
+                if terminal is None:
+                    # The terminal isn't found in grammar.terminals
+                    continue
+                if self._suggestion_does_not_match(ct, ix, terminal):
+                    # If this token is annotated with a spelling suggestion,
+                    # do not add it unless it works grammatically
+                    continue
+            a = Annotation(
+                ix,
+                ix + ct.error_span - 1,
+                error_codes[ix],
+                ct.error_description,
+                ct.error_detail,
+                ct.error_references,
+                ct.error_original,
+                ct.error_suggest,
+            )
+            append(a)
+        # Finally, look for abbreviations and exclamation marks
+        # in the tokens that don't have error codes
+        for ix, t in enumerate(tokens):
+            if error_codes[ix]:
+                # Already handled above
+                continue
+            if t.txt in abbreviations:
                 # We found an abbreviation and we want to write it out
                 # TODO handle TOK.Amount
-                annotate = True
-                if parsed and ix in token_to_terminal:
-                    # For the call to suggestion_does_not_match(), we need a
-                    # BIN_Token instance, which we obtain in a bit of a hacky
-                    # way by creating it on the fly
-                    bin_token = BIN_Parser.wrap_token(t, ix)
-                    # Obtain the original BIN_Terminal instance from the grammar
-                    terminal_index = token_to_terminal[ix]
-                    terminal_node = sent.terminal_nodes[terminal_index]
-                    original_terminal = terminal_node.original_terminal
-                    if original_terminal not in grammar.terminals:
-                        # At least one case, finna→Finna, gets the terminal "person_kvk"
-                        # which isn't found in grammar.terminals!
-                        annotate = False
+                if ix in terminal_by_tok_ix:
+                    terminal = terminal_by_tok_ix[ix]
+                    if terminal is None:
+                        # The terminal isn't found in grammar.terminals
                         continue
-                    assert original_terminal is not None
-                    terminal = grammar.terminals[original_terminal]
-                    assert isinstance(terminal, VariantHandler)
-                    if t.suggestion_does_not_match(terminal, bin_token):  # type: ignore
+                    if self._suggestion_does_not_match(cast(CorrectToken, t), ix, terminal):
                         # If this token is annotated with a spelling suggestion,
                         # do not add it unless it works grammatically
-                        annotate = False
-                if annotate:
-                    a = Annotation(
-                        start=ix,
-                        end=ix,
-                        code="E006",
-                        text="Skammstafanir ætti að skrifa út",
-                        detail="Best er að skrifa skammstafanir út í formlegu máli.",
-                        original=getattr(t, "original", ""),
-                        suggest=getattr(t, "txt", ""),
-                    )
-                    ann.append(a)
+                        continue
+                a = Annotation(
+                    start=ix,
+                    end=ix,
+                    code="E006",
+                    text="Skammstafanir ætti að skrifa út",
+                    detail="Best er að skrifa skammstafanir út í formlegu máli.",
+                    original=getattr(t, "original", ""),
+                    suggest=getattr(t, "txt", ""),
+                )
+                append(a)
 
             elif "!" in t.txt:
                 # Check for exclamation marks in sentence, we wan't to avoid those in professional texts.
-                annotate = True
                 a = Annotation(
                     start=ix,
                     end=ix,
@@ -361,7 +492,7 @@ class GreynirCorrect(Greynir):
                     original=getattr(t, "original", ""),
                     suggest=getattr(t, "txt", ""),
                 )
-                ann.append(a)
+                append(a)
 
         # Then, look at the whole sentence
         num_words = words_in_bin + words_not_in_bin
@@ -402,7 +533,11 @@ class GreynirCorrect(Greynir):
             err_index = sent.err_index or 0
             start = max(0, err_index - 1)
             end = min(len(sent.tokens), err_index + 2)
-            toktext = correct_spaces(" ".join(t.txt for t in sent.tokens[start:end] if t.txt))
+            parts = [t.txt for t in sent.tokens[start:end] if t.txt]
+            toktext = " ".join(parts)
+            if not all(p.isalnum() for p in parts):
+                # Only punctuation and whitespace need spacing corrections
+                toktext = correct_spaces(toktext)
             ann.append(
                 # E001: Unable to parse sentence
                 Annotation(
@@ -419,38 +554,48 @@ class GreynirCorrect(Greynir):
             # Add annotations for error-marked nonterminals from the grammar
             # found in the parse tree
             ErrorFinder(ann, sent).run()
-            pm = PatternMatcher(ann, sent)
-            # Check whether external tone of voice patterns are given
-            if self.settings.tone_of_voice_patterns.PATH:
-                file_path = self.settings.tone_of_voice_patterns.PATH
-                module_name = os.path.splitext(os.path.basename(file_path))[0]
-                # Import the module
-                spec: Optional[ModuleSpec] = importlib.util.spec_from_file_location(module_name, file_path)
-                if spec is None:
-                    raise FileNotFoundError(f"Could not find a spec for module '{module_name}' at '{file_path}'")
-                assert isinstance(spec.loader, Loader)
-                module: ModuleType = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                # Add the external patterns to the pattern matcher
-                module.add_extra_patterns(pm)  # type: ignore # Mypy doesn't know about add_extra_patterns()
-            # Run the pattern matcher on the sentence,
-            # annotating questionable patterns
-            pm.run()
+            if not self._pattern_triggers_known or self._may_match_patterns(sent):
+                # Only create and run a pattern matcher if any of the
+                # pattern trigger lemmas occur in the sentence
+                pm = PatternMatcher(ann, sent)
+                # Check whether external tone of voice patterns are given
+                if self.settings.tone_of_voice_patterns.PATH:
+                    file_path = self.settings.tone_of_voice_patterns.PATH
+                    module_name = os.path.splitext(os.path.basename(file_path))[0]
+                    # Import the module
+                    spec: Optional[ModuleSpec] = importlib.util.spec_from_file_location(module_name, file_path)
+                    if spec is None:
+                        raise FileNotFoundError(
+                            f"Could not find a spec for module '{module_name}' at '{file_path}'"
+                        )
+                    assert isinstance(spec.loader, Loader)
+                    module: ModuleType = importlib.util.module_from_spec(spec)
+                    spec.loader.exec_module(module)
+                    # Add the external patterns to the pattern matcher
+                    module.add_extra_patterns(pm)  # type: ignore # Mypy doesn't know about add_extra_patterns()
+                if not self._pattern_triggers_known:
+                    # The trigger lemmas do not depend on the sentence,
+                    # so we collect them from the first pattern matcher
+                    self._pattern_triggers = pm.trigger_lemmas()
+                    self._pattern_triggers_known = True
+                # Run the pattern matcher on the sentence,
+                # annotating questionable patterns
+                pm.run()
         # Sort the annotations by their start token index,
         # and then by decreasing span length
-        ann.sort(key=lambda a: (a.start, -a.end))
+        ann.sort(key=attrgetter("sort_key"))
         # Eliminate duplicates, i.e. identical annotation
-        # codes for identical spans
-        i = 1
-        while i < len(ann):
-            a, prev = ann[i], ann[i - 1]
-            if a.code == prev.code and a.start == prev.start and a.end == prev.end:
-                # Identical annotation: remove it from the list
-                del ann[i]
-            else:
-                # Check the next pair
-                i += 1
-        return ann
+        # codes for identical spans, in a single pass
+        seen: Set[Tuple[str, int, int]] = set()
+        unique: List[Annotation] = []
+        for a in ann:
+            key = (a.code, a.start, a.end)
+            if key in seen:
+                # Identical annotation: skip it
+                continue
+            seen.add(key)
+            unique.append(a)
+        return unique
 
     def create_sentence(self, job: Job, s: TokenList) -> AnnotatedSentence:
         """Create a fresh sentence object and annotate it
@@ -476,9 +621,13 @@ class GreynirCorrect(Greynir):
             sent = cast(AnnotatedSentence, sent)
             yield sent
 
-    def parse_all_tokens(self, tokens: Iterable[Tok], *, progress_func: ProgressFunc = None) -> CheckResult:
-        """Parse all tokens in the given iterable."""
-        job = _Job(
+    def parse_all_tokens(
+        self, tokens: Iterable[Tok], *, progress_func: ProgressFunc = None, threads: int = 1
+    ) -> CheckResult:
+        """Parse all tokens in the given iterable. If threads > 1,
+        paragraphs are parsed concurrently in a pool of that many
+        threads; the C parser releases the GIL while parsing."""
+        job = (_ThreadSafeJob if threads > 1 else _Job)(
             self,
             tokens,
             parse=True,
@@ -486,7 +635,19 @@ class GreynirCorrect(Greynir):
         )
         # Iterating through the sentences in the job causes
         # them to be parsed and their statistics collected
-        sentences = [cast(AnnotatedSentence, sent) for sent in job]
+        sentences: List[AnnotatedSentence]
+        if threads > 1:
+            # Make sure the parser singleton exists before
+            # the worker threads start asking for it
+            _ = self.parser
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                # The paragraphs are read from the token stream in this
+                # thread, and their sentences are parsed in the pool.
+                # The results are returned in the original order.
+                paragraphs: List[List[AnnotatedSentence]] = list(executor.map(_parse_paragraph, job.paragraphs()))
+            sentences = [sent for pg in paragraphs for sent in pg]
+        else:
+            sentences = [cast(AnnotatedSentence, sent) for sent in job]
         return CheckResult(
             sentences=sentences,
             num_sentences=job.num_sentences,
@@ -82,11 +82,19 @@ class SentenceClassifier:
         if isinstance(text, str):
             text = [text]
 
-        pipe_result = self.pipe([self._domain_prefix + t for t in text])
-        result: List[bool] = [r["generated_text"] == self._true_label for r in pipe_result]
+        result = self.classify_batch(text)
 
         return result[0] if len(result) == 1 else result
 
+    def classify_batch(self, sentences: List[str]) -> List[bool]:
+        """Classify a list of sentences in a single call to the model.
+        Return a list with an entry for each sentence, which is true
+        if the sentence probably contains an error."""
+        if not sentences:
+            return []
+        pipe_result = self.pipe([self._domain_prefix + t for t in sentences])
+        return [r["generated_text"] == self._true_label for r in pipe_result]
+
 
 def _main() -> None:
     classifier = SentenceClassifier()
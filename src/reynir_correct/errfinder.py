@@ -38,7 +38,7 @@
 
 """
 
-from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union, cast
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple, Union, cast
 from typing_extensions import Protocol, TypedDict
 
 import re
@@ -201,12 +201,19 @@ class ErrorDetectionToken(BIN_Token):
     # verbs to appear as normal verbs.
     _RESTRICTIVE_VARIANTS = ("sagnb", "lhþt", "bh")
 
+    # Shared empty default for verb subject lookups, to avoid
+    # allocating a fresh container on every call
+    _NO_SUBJECTS: FrozenSet[str] = frozenset()
+
     @classmethod
     def verb_subject_matches(cls, verb: str, subj: str) -> bool:
         """Returns True if the given subject type/case is allowed
         for this verb or if it is an erroneous subject
         which we can flag"""
-        return subj in cls._VERB_SUBJECTS.get(verb, set()) or subj in cls._VERB_ERROR_SUBJECTS.get(verb, dict())
+        no_subjects = cls._NO_SUBJECTS
+        if subj in cls._VERB_SUBJECTS.get(verb, no_subjects):
+            return True
+        return subj in cls._VERB_ERROR_SUBJECTS.get(verb, no_subjects)
 
     @classmethod
     def verb_matches_arguments(cls, key: str) -> bool:
@@ -295,7 +302,7 @@ class ErrorFinder(ParseForestNavigator):
 
         first, last = self.node_span(node)
         text_func: Callable[[Tok], str] = (lambda t: t.txt) if original_case else text
-        return correct_spaces(" ".join(text_func(t) for t in self._tokens[first : last + 1] if t.txt))
+        return correct_spaces(" ".join([text_func(t) for t in self._tokens[first : last + 1] if t.txt]))
 
     # Functions used to explain grammar errors associated with
     # nonterminals with error tags in the grammar
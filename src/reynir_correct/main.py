@@ -197,7 +197,9 @@ def main() -> None:
         sys.exit(1)
     options = from_args(args)
 
-    print(check_errors(**options), file=args.outfile)
+    # Write the output as it is formatted
+    check_errors(output=args.outfile, **options)
+    args.outfile.write("\n")
 
 
 if __name__ == "__main__":
@@ -2947,19 +2947,41 @@ class PatternMatcher:
             )
         )
 
+    def trigger_lemmas(self) -> Optional[FrozenSet[str]]:
+        """Return the union of the trigger lemmas of all patterns,
+        or None if any pattern has no trigger and is therefore
+        applied to every sentence"""
+        lemmas: Set[str] = set()
+        for trigger, _, _, _ in self.PATTERNS:
+            if not trigger:
+                return None
+            if isinstance(trigger, str):
+                lemmas.add(trigger)
+            else:
+                lemmas.update(trigger)
+        return frozenset(lemmas)
+
+    @staticmethod
+    def sentence_lemmas(sent: Sentence) -> Set[str]:
+        """Return the set of lemmas in the sentence, to be matched
+        against pattern triggers"""
+        # Note that we collect the middle voice lemmas, such as 'dást' for the
+        # verb 'dá'. This means that trigger lemmas should also be middle voice lemmas.
+        lemmas_mm = sent.lemmas_mm
+        if not lemmas_mm:
+            return set()
+        return set(lemma.replace("-", "") for lemma in lemmas_mm)
+
     def run(self) -> None:
         """Apply the patterns to the sentence"""
         tree = None if self._sent is None else self._sent.tree
         if tree is None:
             # No tree: nothing to do
             return
-        # Make a set of the lemmas in the sentence.
-        # Note that we collect the middle voice lemmas, such as 'dást' for the
-        # verb 'dá'. This means that trigger lemmas should also be middle voice lemmas.
-        lemmas_mm = self._sent.lemmas_mm
-        if not lemmas_mm:
+        # Make a set of the lemmas in the sentence
+        lemmas = self.sentence_lemmas(self._sent)
+        if not lemmas:
             return
-        lemmas = set(lemma.replace("-", "") for lemma in lemmas_mm)
 
         def lemma_match(trigger: Union[str, FrozenSet[str], Set[str]]) -> bool:
             """Returns True if any of the given trigger lemmas
@@ -6,7 +6,7 @@ To run for the file 'prufa.txt':
 $ python diffchecker.py prufa.txt
 
 """
-from typing import Dict, Iterable, Iterator, Set, Union
+from typing import Any, Dict
 
 import argparse
 import sys
@@ -29,13 +29,8 @@ parser.add_argument(
 )
 
 
-def gen(f: Iterator[str]) -> Iterable[str]:
-    """Generate the lines of text in the input file"""
-    yield from f
-
-
 def main() -> None:
-    options: Dict[str, Union[str, bool, Set[str]]] = {}
+    options: Dict[str, Any] = {}
     options["format"] = "text"  # text, json, csv, m2
     options["annotations"] = True
     options["all_errors"] = True
@@ -61,8 +56,7 @@ def main() -> None:
         # Nothing we can do
         print("No input has been given, nothing can be returned")
         sys.exit(1)
-    itering = gen(infile)
-    for sent in itering:
+    for sent in infile:
         sent = sent.strip()
         if not sent:
             continue
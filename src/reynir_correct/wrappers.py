@@ -53,14 +53,37 @@
 """
 
 from __future__ import annotations
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+    cast,
+)
 from typing_extensions import TypedDict
 
 import argparse
 import json
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy, deepcopy
 from dataclasses import dataclass
-from functools import partial
+from functools import cached_property, partial
+from multiprocessing import Pool
+from multiprocessing.pool import Pool as PoolType
+from threading import Lock
 
 from tokenizer import TOK, calculate_indexes, detokenize, normalized_text_from_tokens, text_from_tokens
 from tokenizer.definitions import AmountTuple, NumberTuple
@@ -117,8 +140,15 @@ class AnnResultDict(TypedDict):
 ReadFile = argparse.FileType("r", encoding="utf-8")
 WriteFile = argparse.FileType("w", encoding="utf-8")
 
-# Configure our JSON dump function
-json_dumps = partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+# Configure our JSON dump functions. json.dumps() creates a new encoder
+# on every call when given any non-default options, so we create the
+# encoders once and reuse them.
+json_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_json_dumps_spaced = json.JSONEncoder(ensure_ascii=False).encode
+
+
+# Translation table for escaping backslashes and double quotes in quote()
+_QUOTE_TRANS = str.maketrans({"\\": "\\\\", '"': '\\"'})
 
 
 def quote(s: str) -> str:
@@ -126,30 +156,18 @@ def quote(s: str) -> str:
     backslashes and double quotes escaped with a backslash"""
     if not s:
         return '""'
-    return '"' + s.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return '"' + s.translate(_QUOTE_TRANS) + '"'
 
 
-def val(t: CorrectToken, quote_word: bool = False) -> Union[None, str, float, Tuple[Any, ...], Sequence[Any]]:
-    """Return the value part of the token t"""
-    if t.val is None:
-        return None
-    if t.kind in {TOK.WORD, TOK.PERSON, TOK.ENTITY}:
-        # No need to return list of meanings
-        return None
-    if t.kind in {TOK.PERCENT, TOK.NUMBER, TOK.CURRENCY}:
-        return cast(NumberTuple, t.val)[0]
-    if t.kind == TOK.AMOUNT:
-        num, iso, _, _ = cast(AmountTuple, t.val)
-        if quote_word:
-            # Format as "1234.56|USD"
-            return '"{0}|{1}"'.format(num, iso)
-        return num, iso
-    if t.kind == TOK.S_BEGIN:
-        return None
-    if t.kind == TOK.PUNCTUATION:
-        punct = t.punctuation
-        return quote(punct) if quote_word else punct
-    if quote_word and t.kind in {
+# The type of a token value as returned from val()
+TokenValue = Union[None, str, float, Tuple[Any, ...], Sequence[Any]]
+
+# Token kinds whose values (lists of meanings) are not returned from val()
+_NO_VAL_KINDS = frozenset((TOK.WORD, TOK.PERSON, TOK.ENTITY))
+
+# Token kinds whose values are returned as |-delimited lists when quoted
+_QUOTE_LIST_KINDS = frozenset(
+    (
         TOK.DATE,
         TOK.TIME,
         TOK.DATEABS,
@@ -160,11 +178,63 @@ def val(t: CorrectToken, quote_word: bool = False) -> Union[None, str, float, Tu
         TOK.TELNO,
         TOK.NUMWLETTER,
         TOK.MEASUREMENT,
-    }:
-        # Return a |-delimited list of numbers
-        return quote("|".join(str(v) for v in cast(Iterable[Any], t.val)))
-    if quote_word and isinstance(t.val, str):
-        return quote(t.val)
+    )
+)
+
+
+def _val_none(t: CorrectToken, quote_word: bool) -> TokenValue:
+    """No value is returned for this token kind"""
+    return None
+
+
+def _val_number(t: CorrectToken, quote_word: bool) -> TokenValue:
+    """Return the numeric part of a number token value"""
+    return cast(NumberTuple, t.val)[0]
+
+
+def _val_amount(t: CorrectToken, quote_word: bool) -> TokenValue:
+    """Return the number and currency of an amount token"""
+    num, iso, _, _ = cast(AmountTuple, t.val)
+    if quote_word:
+        # Format as "1234.56|USD"
+        return '"{0}|{1}"'.format(num, iso)
+    return num, iso
+
+
+def _val_punctuation(t: CorrectToken, quote_word: bool) -> TokenValue:
+    """Return the normalized punctuation of a punctuation token"""
+    punct = t.punctuation
+    return quote(punct) if quote_word else punct
+
+
+# Value handlers for token kinds that need special treatment in val()
+_VAL_HANDLERS: Dict[int, Callable[[CorrectToken, bool], TokenValue]] = {
+    # No need to return list of meanings
+    TOK.WORD: _val_none,
+    TOK.PERSON: _val_none,
+    TOK.ENTITY: _val_none,
+    TOK.PERCENT: _val_number,
+    TOK.NUMBER: _val_number,
+    TOK.CURRENCY: _val_number,
+    TOK.AMOUNT: _val_amount,
+    TOK.S_BEGIN: _val_none,
+    TOK.PUNCTUATION: _val_punctuation,
+}
+
+
+def val(t: CorrectToken, quote_word: bool = False) -> TokenValue:
+    """Return the value part of the token t"""
+    if t.val is None:
+        return None
+    handler = _VAL_HANDLERS.get(t.kind)
+    if handler is not None:
+        return handler(t, quote_word)
+    if quote_word:
+        if t.kind in _QUOTE_LIST_KINDS:
+            # Return a |-delimited list of numbers
+            return quote("|".join(str(v) for v in cast(Iterable[Any], t.val)))
+        if isinstance(t.val, str):
+            return quote(t.val)
     return t.val
 
 
@@ -182,11 +252,22 @@ class CorrectedSentence:
         if sentence.tree is not None and sentence.terminals is not None:
             # Successfully parsed: use the text from the terminals (where available)
             # since we have more info there, for instance on em/en dashes.
-            # Create a map of token indices to corresponding terminal text
             parsed = True
-            token_map = {t.index: t.text for t in sentence.terminals}
-            for ix, tok in enumerate(tokens):
-                tok.txt = token_map.get(ix, tok.txt)
+            terminals = sentence.terminals
+            if len(terminals) >= len(tokens) // 2:
+                # Most tokens have a terminal: index a list
+                # of terminal texts directly by token index
+                token_texts: List[Optional[str]] = [None] * len(tokens)
+                for t in terminals:
+                    token_texts[t.index] = t.text
+                for tok, text in zip(tokens, token_texts):
+                    if text is not None:
+                        tok.txt = text
+            else:
+                # Create a map of token indices to corresponding terminal text
+                token_map = {t.index: t.text for t in terminals}
+                for ix, tok in enumerate(tokens):
+                    tok.txt = token_map.get(ix, tok.txt)
         return CorrectedSentence(tokens=tokens, parsed=parsed, annotations=sentence.annotations)
 
     def filter_annotations(self, ignore_rules: Set[str]) -> None:
@@ -197,9 +278,14 @@ class CorrectedSentence:
         ann = [a for a in self.annotations if a.code not in ignore_rules]
         self.annotations = ann
 
+    @cached_property
+    def original_text(self) -> str:
+        """The original text of the sentence, created once on demand"""
+        return "".join([t.original or t.txt or "" for t in self.tokens])
+
     def original_str(self) -> str:
         """Return the original text of the sentence"""
-        return "".join(t.original or t.txt for t in self.tokens)
+        return self.original_text
 
     def corrected_str(self, apply_annotations: bool = False) -> str:
         """Return the corrected text of the sentence, with annotation suggestions applied if requested"""
@@ -210,6 +296,11 @@ class CorrectedSentence:
 
 @dataclass
 class ParseResultStats:
+    # Slots are declared explicitly rather than via dataclass(slots=True),
+    # which requires Python 3.10. An instance is created for each slice
+    # of a text in parallel and memoized grammar checking.
+    __slots__ = ("num_sentences", "num_parsed", "num_tokens", "ambiguity", "parse_time")
+
     num_sentences: int
     num_parsed: int
     num_tokens: int
@@ -230,9 +321,21 @@ class CorrectionResult:
             sent.filter_annotations(ignore_rules)
 
 
+# The key of a sentence in the sentence cache of GreynirCorrectAPI:
+# the ignored rules, whether suggestions are suppressed, and the kind,
+# corrected text and original text of each token in the sentence,
+# without the whitespace preceding the sentence
+SentenceKey = Tuple[FrozenSet[str], bool, Tuple[Tuple[int, str, str], ...]]
+# The grammar check result for a slice of a text
+SentenceResult = Tuple[List[CorrectedSentence], ParseResultStats]
+
+
 class GreynirCorrectAPI:
     """A high level api for correcting Icelandic texts"""
 
+    # Maximum number of sentences in the sentence cache
+    _SENTENCE_CACHE_SIZE = 4096
+
     def __init__(
         self,
         gc: GreynirCorrect,
@@ -240,20 +343,60 @@ class GreynirCorrectAPI:
         do_flesch: bool = False,
         rare_word_analyzer: Optional[RareWordsFinder] = None,
         do_grammar_check: bool = True,
+        options: Optional[Dict[str, Any]] = None,
+        memoize: bool = False,
     ):
         self.gc = gc
+        # The options this instance was created with, if any, used to create
+        # identical instances in worker processes for parallel grammar checking
+        self.options = options
         self.do_grammar_check = do_grammar_check
         self.sentence_prefilter = sentence_prefilter
         self.do_flesch = do_flesch
         # If it's defined, it will be used
         self.rare_word_analyzer = rare_word_analyzer
+        # Serializes calls to correct(), which sets up the shared
+        # correction pipeline for each text that it processes
+        self._lock = Lock()
+        # Optional LRU cache of grammar check results for sentences that have
+        # already been checked. This only pays off for texts where identical
+        # sentences recur, such as logs and transcripts, and is therefore opt-in.
+        self._sent_cache: Optional[OrderedDict[SentenceKey, SentenceResult]] = OrderedDict() if memoize else None
+        # The pool of worker processes for parallel grammar checking, created
+        # on first use and kept until close() is called, since each worker
+        # creates its own GreynirCorrectAPI instance when it starts
+        self._pool: Optional[PoolType] = None
+        self._pool_size = 0
+
+    def close(self) -> None:
+        """Shut down the worker processes for parallel grammar checking, if any"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+            self._pool_size = 0
+
+    def __del__(self) -> None:
+        # The attribute may be missing if the constructor failed
+        if getattr(self, "_pool", None) is not None:
+            self.close()
+
+    def _get_pool(self, n_process: int) -> PoolType:
+        """Return the pool of n_process worker processes, creating it if needed"""
+        if self._pool is None or self._pool_size != n_process:
+            self.close()
+            self._pool = Pool(n_process, initializer=_init_worker, initargs=(self.options,))
+            self._pool_size = n_process
+        return self._pool
 
     @staticmethod
     def from_options(**options) -> GreynirCorrectAPI:
         """Create a GreynirCorrectAPI from the given options"""
+        original_options = dict(options)
         settings = load_config(options.pop("tov_config", None))
         do_flesch_analysis = bool(options.pop("flesch", False))
         do_rare_word_analysis = bool(options.pop("rare_words", False))
+        memoize = bool(options.pop("memoize", False))
         pipeline = CorrectionPipeline(
             "",
             settings,
@@ -277,6 +420,8 @@ class GreynirCorrectAPI:
                 do_flesch=do_flesch_analysis,
                 rare_word_analyzer=rare_word_analyzer,
                 do_grammar_check=do_grammar_check,
+                options=original_options,
+                memoize=memoize,
             )
 
         return GreynirCorrectAPI(
@@ -285,6 +430,8 @@ class GreynirCorrectAPI:
             do_flesch=do_flesch_analysis,
             rare_word_analyzer=rare_word_analyzer,
             do_grammar_check=do_grammar_check,
+            options=original_options,
+            memoize=memoize,
         )
 
     def _correct_spelling(
@@ -298,80 +445,510 @@ class GreynirCorrectAPI:
         self.gc.pipeline._suppress_suggestions = suppress_suggestions
         return self.gc.pipeline.tokenize()  # type: ignore
 
-    def _sentence_contains_error(self, corrected_tokens: Iterable[CorrectToken]) -> bool:
-        """Classify a sentence as probably correct or not."""
+    def _filter_error_sentences(self, sentences: List[CorrectedSentence]) -> List[bool]:
+        """Classify sentences as probably correct or not, in a single batch.
+        Return a list with an entry for each sentence, which is true
+        if the sentence probably contains an error."""
         if self.sentence_prefilter is None:
             raise ValueError("Sentence classifier not initialized - did you forget to set sentence_prefilter=True?")
-        original_sentence = "".join(t.original or t.txt for t in corrected_tokens)
-
-        return self.sentence_prefilter.classify(original_sentence)
+        return self.sentence_prefilter.classify_batch([s.original_text for s in sentences])
 
     def _correct_grammar(self, corrected_tokens: Iterable[CorrectToken]) -> CheckResult:
         results = self.gc.parse_all_tokens(corrected_tokens)
         return results
 
+    def _correct_grammar_parallel(
+        self, corrected_tokens: List[CorrectToken], n_process: int
+    ) -> Tuple[List[CorrectedSentence], ParseResultStats]:
+        """Run the grammar check on the sentences of the token list
+        in a pool of n_process worker processes. The pool is kept for later
+        calls, until close() is called, but its startup cost still makes this
+        worthwhile only for large inputs. The sentences and annotations are
+        the same as when checking serially. The statistics are summed over
+        the slices, except that the ambiguity is their token-weighted
+        average, which approximates the ambiguity of a serial check."""
+        if self.options is None:
+            raise ValueError("Parallel grammar checking requires an API instance created with from_options()")
+        slices = _split_sentences(corrected_tokens)
+        if len(slices) <= 1:
+            # Nothing to parallelize
+            check_result = self._correct_grammar(corrected_tokens)
+            return _sentences_and_stats(check_result)
+        return _merge_results(self._check_slices(slices, n_process))
+
+    def _check_slices(self, slices: List[List[CorrectToken]], n_process: int) -> Iterable[SentenceResult]:
+        """Run the grammar check on each of the token slices, in the pool of
+        worker processes if n_process > 1, returning the results in order"""
+        if n_process <= 1 or len(slices) <= 1:
+            return (_sentences_and_stats(self._correct_grammar(sent_tokens)) for sent_tokens in slices)
+        chunksize = max(1, len(slices) // (4 * n_process))
+        pool = self._get_pool(n_process)
+        # imap() returns the results in the original sentence order
+        return pool.imap(_correct_grammar_worker, slices, chunksize=chunksize)
+
+    def _correct_grammar_memoized(
+        self,
+        corrected_tokens: List[CorrectToken],
+        ignore_rules: Optional[Set] = None,
+        suppress_suggestions: bool = False,
+        n_process: int = 1,
+    ) -> Tuple[List[CorrectedSentence], ParseResultStats]:
+        """Run the grammar check on the sentences of the token list,
+        reusing the results for sentences that have been checked before.
+        If n_process > 1, the other sentences are checked in a pool of
+        that many worker processes."""
+        cache = self._sent_cache
+        assert cache is not None
+        if n_process > 1 and self.options is None:
+            raise ValueError("Parallel grammar checking requires an API instance created with from_options()")
+        rules: FrozenSet[str] = frozenset(ignore_rules or ())
+        slices = _split_sentences(corrected_tokens)
+        results: List[Optional[SentenceResult]] = []
+        # The indices of the slices to be checked, by sentence key. A sentence
+        # that recurs within the text is only checked once.
+        misses: OrderedDict[SentenceKey, List[int]] = OrderedDict()
+        for ix, sent_tokens in enumerate(slices):
+            key: SentenceKey = (rules, suppress_suggestions, _sentence_key(sent_tokens))
+            # The cache holds its own copies of the sentences, and each result
+            # gets its own copies, since callers may modify the results, for
+            # instance by filtering the annotations
+            cached = None if key in misses else cache.get(key)
+            # A cached sentence gets the original texts of this occurrence,
+            # which may be preceded by different whitespace
+            sentences_hit = None if cached is None else _rebase_sentences(cached[0], sent_tokens)
+            if cached is None or sentences_hit is None:
+                misses.setdefault(key, []).append(ix)
+                results.append(None)
+            else:
+                cache.move_to_end(key)
+                results.append((sentences_hit, _cached_stats(cached[1])))
+        checked = self._check_slices([slices[indices[0]] for indices in misses.values()], n_process)
+        for (key, indices), (sentences, stats) in zip(misses.items(), checked):
+            cache[key] = (_copy_sentences(sentences), stats)
+            if len(cache) > self._SENTENCE_CACHE_SIZE:
+                # Evict the least recently used sentence
+                cache.popitem(last=False)
+            results[indices[0]] = (sentences, stats)
+            for ix in indices[1:]:
+                sentences_hit = _rebase_sentences(sentences, slices[ix])
+                if sentences_hit is None:
+                    results[ix] = _sentences_and_stats(self._correct_grammar(slices[ix]))
+                else:
+                    results[ix] = (sentences_hit, _cached_stats(stats))
+        return _merge_results(cast(List[SentenceResult], results))
+
     def correct(
-        self, text: Iterable[str], ignore_rules: Optional[Set] = None, suppress_suggestions: bool = False
+        self,
+        text: Iterable[str],
+        ignore_rules: Optional[Set] = None,
+        suppress_suggestions: bool = False,
+        n_process: int = 1,
+    ) -> CorrectionResult:
+        """Correct the input text by first correcting spelling and then grammatical errors.
+        If n_process > 1, sentences are parsed in a pool of that many worker processes.
+        This instance can be shared between threads, which then take turns correcting."""
+        with self._lock:
+            return self._correct(
+                text, ignore_rules=ignore_rules, suppress_suggestions=suppress_suggestions, n_process=n_process
+            )
+
+    def _correct(
+        self,
+        text: Iterable[str],
+        ignore_rules: Optional[Set] = None,
+        suppress_suggestions: bool = False,
+        n_process: int = 1,
     ) -> CorrectionResult:
-        """Correct the input text by first correcting spelling and then grammatical errors."""
-        corrected_tokens = self._correct_spelling(
+        token_stream = self._correct_spelling(
             text, ignore_rules=ignore_rules, suppress_suggestions=suppress_suggestions
         )
-        # Convert the tokens to a list, so it can be reused - this must be done at some point anyway
-        corrected_tokens = list(corrected_tokens)
-        flesch_result = None
-        if self.do_flesch:
-            flesch_score = FleschKincaidScorer.get_score_from_stream(corrected_tokens)
-            flesch_feedback = FleschKincaidScorer.get_feedback(flesch_score)
-            flesch_result = (flesch_score, flesch_feedback)
-        rare_words = None
-        if self.rare_word_analyzer is not None:
-            # TODO: support setting max_words and low_prob_cutoff on function call
-            rare_words = self.rare_word_analyzer.get_rare_words_from_stream(
-                [tok for tok in corrected_tokens if tok.kind == TOK.WORD], max_words=10, low_prob_cutoff=0.00000005
+        if (
+            self.do_grammar_check
+            and not self.do_flesch
+            and self.rare_word_analyzer is None
+            and self.sentence_prefilter is None
+            and self._sent_cache is None
+            and n_process <= 1
+        ):
+            # The grammar check is the only consumer of the tokens: pass the
+            # token stream directly to the parser, which then parses each
+            # sentence as soon as it has been tokenized and corrected
+            return self._grammar_result(
+                _sentences_and_stats(self._correct_grammar(token_stream)), ignore_rules=ignore_rules
+            )
+        # Convert the tokens to a list, so it can be reused
+        corrected_tokens = list(token_stream)
+        flesch_result: Optional[Tuple[float, FleschKincaidFeedback]] = None
+        rare_words: Optional[List[Tuple[str, float]]] = None
+        if not self.do_flesch and self.rare_word_analyzer is None:
+            sentences, parse_result_stats = self._check_sentences(
+                corrected_tokens,
+                ignore_rules=ignore_rules,
+                suppress_suggestions=suppress_suggestions,
+                n_process=n_process,
+            )
+        elif n_process > 1:
+            # The grammar check forks a pool of worker processes, which must not
+            # happen while other threads are running. The readability analyses
+            # are therefore run first, in this thread.
+            if self.do_flesch:
+                flesch_result = self._flesch_result(corrected_tokens)
+            if self.rare_word_analyzer is not None:
+                rare_words = self._rare_words(corrected_tokens)
+            sentences, parse_result_stats = self._check_sentences(
+                corrected_tokens,
+                ignore_rules=ignore_rules,
+                suppress_suggestions=suppress_suggestions,
+                n_process=n_process,
+            )
+        else:
+            # The readability analyses are independent of the grammar check,
+            # so they run in worker threads while the sentences are checked
+            # in this one. The grammar check replaces the text of some tokens,
+            # so the threads get their own copies of the token texts.
+            readability_tokens = cast(
+                List[CorrectToken], [_TextTok(t.kind, t.txt, t.original) for t in corrected_tokens]
             )
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                flesch_future = executor.submit(self._flesch_result, readability_tokens) if self.do_flesch else None
+                rare_words_future = (
+                    executor.submit(self._rare_words, readability_tokens)
+                    if self.rare_word_analyzer is not None
+                    else None
+                )
+                sentences, parse_result_stats = self._check_sentences(
+                    corrected_tokens,
+                    ignore_rules=ignore_rules,
+                    suppress_suggestions=suppress_suggestions,
+                    n_process=n_process,
+                )
+                if flesch_future is not None:
+                    flesch_result = flesch_future.result()
+                if rare_words_future is not None:
+                    rare_words = rare_words_future.result()
+        if parse_result_stats is None:
+            # The grammar check was not run
+            return CorrectionResult(sentences=sentences, flesch_result=flesch_result, rare_words=rare_words)
+        return self._grammar_result(
+            (sentences, parse_result_stats),
+            ignore_rules=ignore_rules,
+            flesch_result=flesch_result,
+            rare_words=rare_words,
+        )
+
+    @staticmethod
+    def _flesch_result(corrected_tokens: List[CorrectToken]) -> Tuple[float, FleschKincaidFeedback]:
+        """Return the Flesch-Kincaid score of the text, with feedback"""
+        flesch_score = FleschKincaidScorer.get_score_from_stream(corrected_tokens)
+        return flesch_score, FleschKincaidScorer.get_feedback(flesch_score)
+
+    def _rare_words(self, corrected_tokens: List[CorrectToken]) -> List[Tuple[str, float]]:
+        """Return the rare words of the text, with their probabilities"""
+        assert self.rare_word_analyzer is not None
+        # TODO: support setting max_words and low_prob_cutoff on function call
+        return self.rare_word_analyzer.get_rare_words_from_stream(
+            [tok for tok in corrected_tokens if tok.kind == TOK.WORD], max_words=10, low_prob_cutoff=0.00000005
+        )
+
+    def _check_sentences(
+        self,
+        corrected_tokens: List[CorrectToken],
+        ignore_rules: Optional[Set] = None,
+        suppress_suggestions: bool = False,
+        n_process: int = 1,
+    ) -> Tuple[List[CorrectedSentence], Optional[ParseResultStats]]:
+        """Run the grammar check on the corrected tokens, if it should be run,
+        returning the sentences and the parse statistics (None if not run)"""
         if not self.do_grammar_check:
             # Only run the spelling correction
-            return CorrectionResult(
-                sentences=[CorrectedSentence(tokens=corrected_tokens, parsed=False)],
-                flesch_result=flesch_result,
-                rare_words=rare_words,
-            )
+            return [CorrectedSentence(tokens=corrected_tokens, parsed=False)], None
         # Only run the sentence classifier if we should
         if self.sentence_prefilter is not None:
-            # Check if the sentence contains an error
-            # TODO: We will want to chunk the input into sentences and run the classifier on each sentence
-            if not self._sentence_contains_error(corrected_tokens):
-                # The sentence is probably correct, so we skip the rest of the processing
-                return CorrectionResult(
-                    sentences=[CorrectedSentence(tokens=corrected_tokens, parsed=False)],
-                    flesch_result=flesch_result,
-                    rare_words=rare_words,
-                )
-            # The sentence is probably incorrect, so we continue with the full grammar check
-        # Run the full grammar check
-        check_result = self._correct_grammar(corrected_tokens)
-        corrected_sentences = [CorrectedSentence.from_parser_sentence(sentence=s) for s in check_result["sentences"]]
+            return self._check_error_sentences(
+                corrected_tokens,
+                ignore_rules=ignore_rules,
+                suppress_suggestions=suppress_suggestions,
+                n_process=n_process,
+            )
+        return self._check_grammar(
+            corrected_tokens, ignore_rules=ignore_rules, suppress_suggestions=suppress_suggestions, n_process=n_process
+        )
+
+    def _check_error_sentences(
+        self,
+        corrected_tokens: List[CorrectToken],
+        ignore_rules: Optional[Set] = None,
+        suppress_suggestions: bool = False,
+        n_process: int = 1,
+    ) -> Tuple[List[CorrectedSentence], Optional[ParseResultStats]]:
+        """Classify the sentences of the token list in a single batch and run
+        the full grammar check only on those that probably contain an error"""
+        # Slices without any words, such as the tokens after the last sentence
+        # end or a sentence of only punctuation, which the parser skips, are
+        # kept with the following sentence, or the preceding one at the end.
+        # Thus no tokens are lost, and each sentence that is checked yields
+        # exactly one checked sentence.
+        sentences: List[CorrectedSentence] = []
+        pending: List[CorrectToken] = []
+        for toks in _split_sentences(corrected_tokens):
+            if not any(t.kind != TOK.PUNCTUATION and t.kind < TOK.META_BEGIN for t in toks):
+                pending.extend(toks)
+                continue
+            sentences.append(CorrectedSentence(tokens=pending + toks, parsed=False))
+            pending = []
+        if not sentences:
+            # No words at all: nothing to classify or check
+            return [CorrectedSentence(tokens=corrected_tokens, parsed=False)], None
+        if pending:
+            sentences[-1] = CorrectedSentence(tokens=sentences[-1].tokens + pending, parsed=False)
+        has_error = self._filter_error_sentences(sentences)
+        if not any(has_error):
+            # All sentences are probably correct, so we skip the grammar check
+            return sentences, None
+        # Run the full grammar check once, on all the sentences that probably
+        # contain an error, and put the checked sentences in their places
+        checked, parse_result_stats = self._check_grammar(
+            [t for s, error in zip(sentences, has_error) if error for t in s.tokens],
+            ignore_rules=ignore_rules,
+            suppress_suggestions=suppress_suggestions,
+            n_process=n_process,
+        )
+        checked_iter = iter(checked)
+        result = [next(checked_iter, s) if error else s for s, error in zip(sentences, has_error)]
+        # Should the parser have split a sentence in two, nothing is lost
+        result.extend(checked_iter)
+        return result, parse_result_stats
+
+    def _check_grammar(
+        self,
+        corrected_tokens: List[CorrectToken],
+        ignore_rules: Optional[Set] = None,
+        suppress_suggestions: bool = False,
+        n_process: int = 1,
+    ) -> SentenceResult:
+        """Run the full grammar check on the token list"""
+        if self._sent_cache is not None:
+            return self._correct_grammar_memoized(
+                corrected_tokens,
+                ignore_rules=ignore_rules,
+                suppress_suggestions=suppress_suggestions,
+                n_process=n_process,
+            )
+        if n_process > 1:
+            return self._correct_grammar_parallel(corrected_tokens, n_process)
+        return _sentences_and_stats(self._correct_grammar(corrected_tokens))
+
+    @staticmethod
+    def _grammar_result(
+        sentences_and_stats: Tuple[List[CorrectedSentence], ParseResultStats],
+        ignore_rules: Optional[Set] = None,
+        flesch_result: Optional[Tuple[float, FleschKincaidFeedback]] = None,
+        rare_words: Optional[List[Tuple[str, float]]] = None,
+    ) -> CorrectionResult:
+        """Assemble the result of a full grammar check"""
+        corrected_sentences, parse_result_stats = sentences_and_stats
         result = CorrectionResult(
             sentences=corrected_sentences,
             flesch_result=flesch_result,
             rare_words=rare_words,
-            parse_result_stats=ParseResultStats(
-                num_sentences=check_result["num_sentences"],
-                num_parsed=check_result["num_parsed"],
-                num_tokens=check_result["num_tokens"],
-                ambiguity=check_result["ambiguity"],
-                parse_time=check_result["parse_time"],
-            ),
+            parse_result_stats=parse_result_stats,
         )
         # Filter annotations based on ignore rules
         result.filter_annotations(ignore_rules=ignore_rules or set())
         return result
 
 
-def check_errors(**options: Any) -> str:
+def _sentences_and_stats(check_result: CheckResult) -> Tuple[List[CorrectedSentence], ParseResultStats]:
+    """Convert a grammar check result to corrected sentences and parse statistics"""
+    corrected_sentences = [CorrectedSentence.from_parser_sentence(sentence=s) for s in check_result.sentences]
+    stats = ParseResultStats(
+        num_sentences=check_result.num_sentences,
+        num_parsed=check_result.num_parsed,
+        num_tokens=check_result.num_tokens,
+        ambiguity=check_result.ambiguity,
+        parse_time=check_result.parse_time,
+    )
+    return corrected_sentences, stats
+
+
+def _cached_stats(stats: ParseResultStats) -> ParseResultStats:
+    """Return the statistics for a sentence taken from the sentence cache"""
+    # Nothing was parsed
+    return ParseResultStats(
+        num_sentences=stats.num_sentences,
+        num_parsed=stats.num_parsed,
+        num_tokens=stats.num_tokens,
+        ambiguity=stats.ambiguity,
+        parse_time=0.0,
+    )
+
+
+def _split_sentences(tokens: List[CorrectToken]) -> List[List[CorrectToken]]:
+    """Split a token list into sentences, at TOK.S_END boundaries.
+    Any tokens after the last sentence end form the last slice."""
+    slices: List[List[CorrectToken]] = []
+    start = 0
+    for ix, t in enumerate(tokens):
+        if t.kind == TOK.S_END:
+            slices.append(tokens[start : ix + 1])
+            start = ix + 1
+    if start < len(tokens):
+        slices.append(tokens[start:])
+    return slices
+
+
+def _copy_sentences(sentences: List[CorrectedSentence]) -> List[CorrectedSentence]:
+    """Return copies of the given sentences, with copies of their token
+    and annotation lists and of the tokens themselves"""
+    return [
+        CorrectedSentence(
+            tokens=[copy(t) for t in s.tokens],
+            parsed=s.parsed,
+            annotations=None if s.annotations is None else list(s.annotations),
+        )
+        for s in sentences
+    ]
+
+
+def _sentence_key(sent_tokens: List[CorrectToken]) -> Tuple[Tuple[int, str, str], ...]:
+    """Return the kind, text and original text of each token in a sentence,
+    where the original text of the first token is stripped of the whitespace
+    preceding the sentence, for use in a sentence cache key"""
+    key: List[Tuple[int, str, str]] = []
+    leading = True
+    for t in sent_tokens:
+        original = t.original or ""
+        if leading and original:
+            original = original.lstrip()
+            leading = not original
+        key.append((t.kind, t.txt, original))
+    return tuple(key)
+
+
+def _rebase_sentences(
+    sentences: List[CorrectedSentence], sent_tokens: List[CorrectToken]
+) -> Optional[List[CorrectedSentence]]:
+    """Return copies of cached sentences where the original texts of the
+    tokens are taken from the given tokens of an identical sentence, so
+    that character offsets are calculated from those. Return None if the
+    text tokens of the sentences and the given tokens don't line up."""
+    copies = _copy_sentences(sentences)
+    if not copies:
+        # No sentence, such as for a slice with punctuation only
+        return copies
+    cached_toks = [t for s in copies for t in s.tokens if t.kind < TOK.META_BEGIN]
+    toks = [t for t in sent_tokens if t.kind < TOK.META_BEGIN]
+    if len(cached_toks) != len(toks):
+        return None
+    for cached_tok, tok in zip(cached_toks, toks):
+        cached_tok.original = tok.original
+        cached_tok.origin_spans = tok.origin_spans
+    return copies
+
+
+def _merge_results(results: Iterable[SentenceResult]) -> SentenceResult:
+    """Merge the grammar check results of consecutive slices of a text"""
+    corrected_sentences: List[CorrectedSentence] = []
+    stats = ParseResultStats(num_sentences=0, num_parsed=0, num_tokens=0, ambiguity=0.0, parse_time=0.0)
+    weighted_ambiguity = 0.0
+    for sentences, slice_stats in results:
+        corrected_sentences.extend(sentences)
+        stats.num_sentences += slice_stats.num_sentences
+        stats.num_parsed += slice_stats.num_parsed
+        stats.num_tokens += slice_stats.num_tokens
+        stats.parse_time += slice_stats.parse_time
+        weighted_ambiguity += slice_stats.ambiguity * slice_stats.num_tokens
+    # The overall ambiguity is the token-weighted average of the slices
+    stats.ambiguity = weighted_ambiguity / stats.num_tokens if stats.num_tokens else 1.0
+    return corrected_sentences, stats
+
+
+# The GreynirCorrectAPI instance of a worker process in parallel grammar checking
+_worker_api: Optional[GreynirCorrectAPI] = None
+
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    """Create the GreynirCorrectAPI instance of a worker process,
+    once per process, to avoid pickling the parser"""
+    global _worker_api
+    options = dict(options)
+    # The workers only parse: they don't need the classifier or the readability analyses
+    for key in ("sentence_prefilter", "flesch", "rare_words"):
+        options.pop(key, None)
+    _worker_api = GreynirCorrectAPI.from_options(**options)
+
+
+def _correct_grammar_worker(
+    tokens: List[CorrectToken],
+) -> Tuple[List[CorrectedSentence], ParseResultStats]:
+    """Run the grammar check on a slice of tokens in a worker process"""
+    assert _worker_api is not None
+    return _sentences_and_stats(_worker_api._correct_grammar(tokens))
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert an option value to a hashable equivalent,
+    raising TypeError if that is not possible"""
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    hash(value)
+    return value
+
+
+# Maximum number of distinct options for which GreynirCorrectAPI
+# instances are kept for reuse by check_errors()
+_API_CACHE_SIZE = 8
+# Frozen options, used as a key to the cache of GreynirCorrectAPI instances
+OptionsKey = Tuple[Tuple[str, Hashable], ...]
+# Idle GreynirCorrectAPI instances by frozen options, in least recently used order
+_api_cache: OrderedDict[OptionsKey, List[GreynirCorrectAPI]] = OrderedDict()
+_api_cache_lock = Lock()
+
+
+def _get_api(options: Dict[str, Any]) -> Tuple[Optional[OptionsKey], GreynirCorrectAPI]:
+    """Return a GreynirCorrectAPI instance for the given options, reusing an
+    idle, previously created one if possible, along with the key for returning
+    it to the cache with _put_api(), or None if it can't be cached. An instance
+    is only used by one caller at a time, so that concurrent callers don't have
+    to take turns with it."""
+    try:
+        # The frozen options are only used as the cache key
+        options_key: Optional[OptionsKey] = tuple(sorted((k, _freeze(v)) for k, v in options.items()))
+    except TypeError:
+        # An option value that can't be used as a key: create a fresh instance
+        return None, GreynirCorrectAPI.from_options(**options)
+    with _api_cache_lock:
+        idle = _api_cache.get(options_key)
+        if idle:
+            return options_key, idle.pop()
+    # The instance is created from the caller's options as given, copied
+    # so that later changes to them by the caller don't affect the instance
+    return options_key, GreynirCorrectAPI.from_options(**deepcopy(options))
+
+
+def _put_api(options_key: OptionsKey, api: GreynirCorrectAPI) -> None:
+    """Return an instance obtained from _get_api() to the cache, for reuse"""
+    with _api_cache_lock:
+        idle = _api_cache.get(options_key)
+        if idle is None:
+            idle = _api_cache[options_key] = []
+        else:
+            _api_cache.move_to_end(options_key)
+        idle.append(api)
+        if len(_api_cache) > _API_CACHE_SIZE:
+            # Evict the instances for the least recently used options
+            _api_cache.popitem(last=False)
+
+
+def check_errors(*, output: Optional[TextIO] = None, **options: Any) -> str:
     """Return a string in the chosen format and correction level
-    using the spelling and grammar checker"""
+    using the spelling and grammar checker. If an output stream is
+    given, the result is written to it as it is formatted, and an
+    empty string is returned."""
     all_errors = options.pop("all_errors", True)
     text = options.pop("input", None)
     format = options.pop("format", "json")
@@ -381,15 +958,38 @@ def check_errors(**options: Any) -> str:
     print_all = options.pop("print_all", False)
     ignore_rules = options.pop("ignore_rules", set())
     suppress_suggestions = options.pop("suppress_suggestions", False)
+    n_process = options.pop("n_process", 1)
     if text is None:
         raise ValueError("No input text")
-    api = GreynirCorrectAPI.from_options(**options)
     if isinstance(text, str):
         text = [text]
-    results = api.correct(text, ignore_rules=ignore_rules, suppress_suggestions=suppress_suggestions)
+    if n_process > 1:
+        # The worker processes of an instance are kept until it is closed,
+        # so instances for parallel grammar checking are not reused
+        api = GreynirCorrectAPI.from_options(**options)
+        try:
+            results = api.correct(
+                text, ignore_rules=ignore_rules, suppress_suggestions=suppress_suggestions, n_process=n_process
+            )
+        finally:
+            api.close()
+    else:
+        # Creating the API loads the configuration and builds the correction
+        # pipeline, so the instance is reused between calls with the same options
+        options_key, api = _get_api(options)
+        results = api.correct(text, ignore_rules=ignore_rules, suppress_suggestions=suppress_suggestions)
+        if options_key is not None:
+            _put_api(options_key, api)
     text_results = ""
     if all_errors:
-        text_results = format_output(results=results, format=format, print_annotations=annotations)
+        if output is not None:
+            # Stream the formatted lines to the output
+            for ix, line in enumerate(format_output_iter(results, format, print_annotations=annotations)):
+                if ix:
+                    output.write("\n")
+                output.write(line)
+        else:
+            text_results = format_output(results=results, format=format, print_annotations=annotations)
     else:
         text_results = format_spelling(
             results=results,
@@ -407,6 +1007,9 @@ def check_errors(**options: Any) -> str:
         text_results += "\nRare words:\n"
         for word, _prob in results.rare_words:
             text_results += f"\t{word}\n"
+    if output is not None:
+        output.write(text_results)
+        return ""
     return text_results
 
 
@@ -418,7 +1021,37 @@ def format_spelling(
     print_annotations: bool = False,
     print_all: bool = False,
 ) -> str:
-    # Initialize sentence accumulator list
+    # The format is dispatched once, to a function with a
+    # format-specific loop over the sentences and tokens
+    annlist: List[str] = []
+    if format == "text":
+        unisum, annlist = _format_spelling_text(results, spaced, normalize, print_annotations, print_all)
+    elif format == "csv":
+        unisum = _format_spelling_csv(results)
+    elif format == "json":
+        unisum = _format_spelling_json(results)
+    else:
+        unisum = []
+    if print_all:
+        # We want the annotations at the bottom
+        unistr = " ".join(unisum)
+        if annlist:
+            unistr = unistr + "\n" + "\n".join(annlist)
+    else:
+        unistr = "\n".join(unisum)
+    return unistr
+
+
+def _format_spelling_text(
+    results: CorrectionResult,
+    spaced: bool,
+    normalize: bool,
+    print_annotations: bool,
+    print_all: bool,
+) -> Tuple[List[str], List[str]]:
+    """Return the text of each sentence, optionally followed by its annotations.
+    If print_all is set, the annotations are instead returned in a separate
+    list, to be printed after all the text."""
     # Function to convert a token list to output text
     if spaced:
         if normalize:
@@ -428,83 +1061,107 @@ def format_spelling(
     else:
         to_text = partial(detokenize, normalize=True)
     unisum: List[str] = []
-    allsum: List[str] = []
     annlist: List[str] = []
     for sent in results.sentences:
-        sent_tokens = sent.tokens
-        if format == "text":
-            txt = to_text(sent_tokens)
-            if print_annotations:
-                for t in sent_tokens:
-                    if t.error:
-                        annlist.append(str(t.error))
-                if annlist and not print_all:
-                    txt = txt + "\n" + "\n".join(annlist)
-                    annlist = []
-            unisum.append(txt)
-            continue
-        for t in sent_tokens:
-            if format == "csv":
-                if t.txt:
-                    allsum.append(
-                        "{0},{1},{2},{3}".format(
-                            t.kind,
-                            quote(t.txt),
-                            val(t, quote_word=True) or '""',
-                            quote(str(t.error) if t.error else ""),
-                        )
-                    )
-                elif t.kind == TOK.S_END:
-                    # Indicate end of sentence
-                    allsum.append('0,"",""')
-            elif format == "json":
-                # Output the tokens in JSON format, one line per token
-                d: Dict[str, Any] = dict(k=TOK.descr[t.kind])
-                if t.txt is not None:
-                    d["t"] = t.txt
-                v = val(t)
-                if t.kind not in {TOK.WORD, TOK.PERSON, TOK.ENTITY} and v is not None:
-                    d["v"] = v
-                if isinstance(t.error, Error):
-                    d["e"] = t.error.to_dict()
-                allsum.append(json_dumps(d))
-        if allsum:
-            unisum.extend(allsum)
-            allsum = []
-    if print_all:
-        # We want the annotations at the bottom
-        unistr = " ".join(unisum)
-        if annlist:
-            unistr = unistr + "\n" + "\n".join(annlist)
-    else:
-        unistr = "\n".join(unisum)
-    return unistr
+        txt = to_text(sent.tokens)
+        if print_annotations:
+            annlist.extend(str(t.error) for t in sent.tokens if t.error)
+            if annlist and not print_all:
+                txt = txt + "\n" + "\n".join(annlist)
+                annlist.clear()
+        unisum.append(txt)
+    return unisum, annlist
+
+
+def _format_spelling_csv(results: CorrectionResult) -> List[str]:
+    """Return the tokens in CSV format, one line per token"""
+    unisum: List[str] = []
+    # Local bindings for the per-token loop
+    append = unisum.append
+    s_end = TOK.S_END
+    empty = quote("")
+    for sent in results.sentences:
+        for t in sent.tokens:
+            txt = t.txt
+            if txt:
+                error = t.error
+                append(
+                    f"{t.kind},{quote(txt)},{val(t, quote_word=True) or empty},"
+                    f"{quote(str(error)) if error else empty}"
+                )
+            elif t.kind == s_end:
+                # Indicate end of sentence
+                append('0,"",""')
+    return unisum
+
+
+def _format_spelling_json(results: CorrectionResult) -> List[str]:
+    """Return the tokens in JSON format, one line per token"""
+    unisum: List[str] = []
+    descr = TOK.descr
+    for sent in results.sentences:
+        for t in sent.tokens:
+            d: Dict[str, Any] = dict(k=descr[t.kind])
+            if t.txt is not None:
+                d["t"] = t.txt
+            v = val(t)
+            if t.kind not in _NO_VAL_KINDS and v is not None:
+                d["v"] = v
+            if isinstance(t.error, Error):
+                d["e"] = t.error.to_dict()
+            unisum.append(json_dumps(d))
+    return unisum
+
+
+class _TextTok(NamedTuple):
+    """A lightweight stand-in for a token, carrying only its kind and texts,
+    for functions that don't need more, such as detokenize()"""
+
+    kind: int
+    txt: str
+    original: Optional[str]
 
 
 def fully_correct_sentence(tokens: List[CorrectToken], annotations: List[Annotation]) -> str:
     """Fully correct a sentence by applying the annotations to the tokens and return the text"""
-    # Sort in ascending order by token start index, and then by end index
-    # (more narrow/specific annotations before broader ones)
-    annotations.sort(key=lambda ann: (ann.start, ann.end), reverse=True)
-
-    # Generate a sentence with all corrections applied
-    full_correction_toks = tokens[:]
-    for ann in annotations:
+    # Map each start token index to the suggested text for the span starting
+    # there, and to the last token index covered by annotations starting there.
+    # Where several annotations start at the same token, the narrowest one
+    # provides the text.
+    suggestions: Dict[int, str] = {}
+    span_ends: Dict[int, int] = {}
+    for ann in sorted(annotations, key=lambda ann: (ann.start, ann.end), reverse=True):
         if ann.suggest is None:
             # Nothing to correct with, nothing we can do
             continue
-        full_correction_toks[ann.start].txt = ann.suggest
-        if ann.end > ann.start:
-            # Annotation spans many tokens
-            # "Okkur börnunum langar í fisk"
-            # "Leita að kílómeter af féinu" → leita að kílómetri af fénu → leita að kílómetra af fénu
-            # "dást af þeim" → "dást að þeim"
-            # Single-token annotations for this span have already been handled
-            # Only case is one ann, many toks in toklist
-            # Give the first token the correct value
-            # Delete the other tokens
-            del full_correction_toks[ann.start + 1 : ann.end + 1]
-    fully_corrected_sentence = detokenize(full_correction_toks)
+        suggestions[ann.start] = ann.suggest
+        span_ends[ann.start] = max(ann.end, span_ends.get(ann.start, ann.end))
+    if not suggestions:
+        # Nothing to apply: the corrected text is the text of the tokens as they are
+        return detokenize(tokens)
+
+    # Generate a sentence with all corrections applied, in a single pass.
+    # An annotation spanning many tokens gives its first token the suggested
+    # text and deletes the other tokens:
+    # "Okkur börnunum langar í fisk"
+    # "Leita að kílómeter af féinu" → leita að kílómetri af fénu → leita að kílómetra af fénu
+    # "dást af þeim" → "dást að þeim"
+    full_correction_toks: List[Union[CorrectToken, _TextTok]] = []
+    skip_until = -1
+    for ix, tok in enumerate(tokens):
+        if ix <= skip_until:
+            # Covered by a preceding annotation spanning many tokens.
+            # The span of an annotation starting here is deleted as well.
+            skip_until = max(skip_until, span_ends.get(ix, ix))
+            continue
+        suggest = suggestions.get(ix)
+        if suggest is not None:
+            # Substitute the suggested text, leaving the original token unmodified
+            full_correction_toks.append(_TextTok(tok.kind, suggest, tok.original))
+            skip_until = span_ends[ix]
+        else:
+            full_correction_toks.append(tok)
+    fully_corrected_sentence = detokenize(cast(List[CorrectToken], full_correction_toks))
     return fully_corrected_sentence
 
 
@@ -520,39 +1177,55 @@ def format_output(
     `format_type` is the output format to use, one of 'text', 'json', 'csv', 'm2'
     `extra_text_options` takes extra options for the text format. Ignored for other formats.
     """
+    return "\n".join(format_output_iter(results, format, print_annotations=print_annotations))
+
 
+def format_output_iter(
+    results: CorrectionResult,
+    format: str,
+    print_annotations: bool = False,
+) -> Iterator[str]:
+    """Format grammar analysis results in the given format,
+    yielding the output one line at a time, without line endings"""
     if format == "text":
-        return format_text(results, print_annotations=print_annotations)
+        return format_text_iter(results, print_annotations=print_annotations)
     elif format == "json":
-        return format_json(results)
+        return format_json_iter(results)
     elif format == "csv":
-        return format_csv(results)
+        return format_csv_iter(results)
     elif format == "m2":
-        return format_m2(results)
+        return format_m2_iter(results)
 
     raise ValueError(f"Tried to format with invalid format: {format}")
 
 
 def format_text(results: CorrectionResult, print_annotations: bool = False) -> str:
-    output: List[str] = []
+    return "\n".join(format_text_iter(results, print_annotations=print_annotations))
+
+
+def format_text_iter(results: CorrectionResult, print_annotations: bool = False) -> Iterator[str]:
     for result in results.sentences:
         txt = fully_correct_sentence(result.tokens, result.annotations or [])
 
         if print_annotations:
             txt = txt + "\n" + "\n".join(str(ann) for ann in result.annotations or [])
-        output.append(txt)
-
-    return "\n".join(output)
+        yield txt
 
 
 def format_json(results: CorrectionResult) -> str:
-    formatted_sentences: List[str] = []
+    return "\n".join(format_json_iter(results))
 
+
+def format_json_iter(results: CorrectionResult) -> Iterator[str]:
     offset = 0
     for result in results.sentences:
         # Calculate the character offsets of the tokens in the original text
         # This returns [0, ... , len(x)]
         char_indexes, _ = calculate_indexes(result.tokens, last_is_end=True)
+        if offset:
+            # Make the offsets relative to the start of the checked text,
+            # once for all uses below
+            char_indexes = [index + offset for index in char_indexes]
 
         # Convert the annotations to a standard format before encoding in JSON
         formatted_annotations: List[AnnDict] = [
@@ -562,10 +1235,10 @@ def format_json(results: CorrectionResult) -> str:
                 # End token index (inclusive)
                 end=ann.end,
                 # Character offset of the start of the annotation in the original text
-                start_char=char_indexes[ann.start] + offset,
+                start_char=char_indexes[ann.start],
                 # Character offset of the end of the annotation in the original text
                 # (inclusive, i.e. the offset of the last character)
-                end_char=char_indexes[ann.end + 1] - 1 + offset,
+                end_char=char_indexes[ann.end + 1] - 1,
                 code=ann.code,
                 text=ann.text,
                 detail=ann.detail or "",
@@ -575,46 +1248,44 @@ def format_json(results: CorrectionResult) -> str:
         ]
         # The offset for the next sentence is the end of the last annotation + 1
         ard = AnnResultDict(
-            original=result.original_str(),
+            original=result.original_text,
             corrected=result.corrected_str(apply_annotations=True),
             tokens=[
-                AnnTokenDict(k=tok.kind, x=tok.txt, o=tok.original or "", i=index + offset)
+                AnnTokenDict(k=tok.kind, x=tok.txt, o=tok.original or "", i=index)
                 for tok, index in zip(result.tokens, char_indexes)
             ],
             annotations=formatted_annotations,
         )
 
-        formatted_sentences.append(json.dumps(ard, ensure_ascii=False))
-        # The offset for the next sentence needs to be increased by the length of this (original) sentence
-        offset += char_indexes[-1]
-
-    return "\n".join(formatted_sentences)
+        yield _json_dumps_spaced(ard)
+        # The offset for the next sentence is the end of this (original) sentence
+        offset = char_indexes[-1]
 
 
 def format_csv(results: CorrectionResult) -> str:
-    accumul: List[str] = []
+    return "\n".join(format_csv_iter(results))
+
+
+def format_csv_iter(results: CorrectionResult) -> Iterator[str]:
     for result in results.sentences:
         for ann in result.annotations or []:
-            accumul.append(
-                "{},{},{},{},{},{}".format(
-                    ann.code,
-                    ann.original,
-                    ann.suggest,
-                    ann.start,
-                    ann.end,
-                    ann.suggestlist,
-                )
+            yield "{},{},{},{},{},{}".format(
+                ann.code,
+                ann.original,
+                ann.suggest,
+                ann.start,
+                ann.end,
+                ann.suggestlist,
             )
-    return "\n".join(accumul)
 
 
 def format_m2(results: CorrectionResult) -> str:
-    accumul: List[str] = []
+    return "\n".join(format_m2_iter(results))
+
+
+def format_m2_iter(results: CorrectionResult) -> Iterator[str]:
     for result in results.sentences:
-        accumul.append("S {0}".format(" ".join(t.txt for t in result.tokens)))
+        yield "S " + " ".join([t.txt for t in result.tokens])
         for ann in result.annotations or []:
-            accumul.append(
-                "A {0} {1}|||{2}|||{3}|||REQUIRED|||-NONE-|||0".format(ann.start, ann.end, ann.code, ann.suggest)
-            )
-        accumul.append("")
-    return "\n".join(accumul)
+            yield f"A {ann.start} {ann.end}|||{ann.code}|||{ann.suggest}|||REQUIRED|||-NONE-|||0"
+        yield ""
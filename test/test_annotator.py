@@ -266,6 +266,46 @@ def test_lhþt_variant(api) -> None:
         assert False, "Regression in handling of LHÞT variants in BinPackage"
 
 
+def test_memoized_suggestions(api) -> None:
+    """Check that memoizing suggestion_does_not_match() gives the same
+    annotations as not memoizing it, for a misspelled word both at the
+    start of a sentence and in the middle of one, where its meanings differ"""
+    gc = reynir_correct.GreynirCorrect(api.gc.settings, api.gc.pipeline, memoize_suggestions=True)
+    memo_api = reynir_correct.GreynirCorrectAPI(gc)
+    sents = [
+        "Kaupti hann nýjan bíl í gær?",
+        "Hann kaupti nýjan bíl í gær.",
+        "Kaupti hann nýjan bíl í gær?",
+        "Hann kaupti nýjan bíl í gær.",
+    ]
+    for s in sents:
+        expected = [(a.start, a.end, a.code, a.suggest) for sent in api.correct(s).sentences for a in sent.annotations]
+        memoized = [
+            (a.start, a.end, a.code, a.suggest) for sent in memo_api.correct(s).sentences for a in sent.annotations
+        ]
+        assert memoized == expected, s
+
+
+def test_threaded_parse(api) -> None:
+    """Check that parsing paragraphs in threads gives the
+    same sentences and statistics as parsing them serially"""
+    text = (
+        "[[ Hundurinn hans Páls fóru í bað í gær. Manninum á verkstæðinu vantaði hamar. ]] "
+        "[[ Allir kettirnir í götunni var að elta mýs. ]] "
+        "[[ Fjöldi þingmanna greiddu atkvæði gegn tillögunni. Þetta er rétt. ]]"
+    )
+    serial = api.gc.parse_all_tokens(list(api._correct_spelling([text])))
+    threaded = api.gc.parse_all_tokens(list(api._correct_spelling([text])), threads=3)
+    assert threaded.num_sentences == serial.num_sentences == 5
+    assert threaded.num_parsed == serial.num_parsed
+    assert threaded.num_tokens == serial.num_tokens
+    assert threaded.ambiguity == pytest.approx(serial.ambiguity)
+    assert [s.tidy_text for s in threaded.sentences] == [s.tidy_text for s in serial.sentences]
+    assert [[(a.start, a.end, a.code) for a in s.annotations] for s in threaded.sentences] == [
+        [(a.start, a.end, a.code) for a in s.annotations] for s in serial.sentences
+    ]
+
+
 if __name__ == "__main__":
     from reynir_correct import GreynirCorrect
 
@@ -357,3 +357,46 @@ def test_dir_loc(api):
     check_sentence(api, s, [])
     s = "Ég ólst upp í Breiðholtinu."
     check_sentence(api, s, [])
+
+
+def annotations_of(result):
+    return [[(a.start, a.end, a.code) for a in sent.annotations or []] for sent in result.sentences]
+
+
+@pytest.mark.parametrize(
+    "s, code",
+    [
+        ("Ráðherrann dáðist af hugrekki stjórnarandstöðunnar.", "P_WRONG_PREP_AF"),
+        ("Hver leitar af skrifstofuhúsnæði?", "P_WRONG_PREP_AF"),
+        ("Hetjan á heiður að björguninni.", "P_WRONG_PREP_AÐ"),
+        ("Að öllu óbreyttu er hann hluti að heildinni.", "P_WRONG_PREP_AÐ"),
+        ("Ég hef búið á Hafnarfirði alla mína tíð en flyt nú í Akureyri.", "P_WRONG_PLACE_PP"),
+        ("Börnin voru út á túni allan daginn.", "P_DIR_LOC"),
+        ("Málið liggur í augum upp.", "P_DIR_LOC"),
+        ("Ég er ekki að skilja þetta.", "P_VeraAð"),
+        ("Ég kláraði verkefnið þrátt fyrir að ég var syfjaður.", "P_MOOD_ACK"),
+        ("Hann kemur ef hann geti.", "P_MOOD_COND"),
+        ("Við keyptum brauð né ost.", "P_Né"),
+    ],
+)
+def test_pattern_triggers(api, monkeypatch, s, code):
+    """Check that sentences which trigger a pattern are not skipped
+    by the trigger lemma check, and are annotated as if every sentence
+    went through the pattern matcher"""
+    # Make sure that the trigger lemmas of the patterns are known
+    api.correct("Ég fór heim.")
+    assert api.gc._pattern_triggers_known
+    may_match_patterns = api.gc._may_match_patterns
+    decisions = []
+
+    def record(sent):
+        decisions.append(may_match_patterns(sent))
+        return decisions[-1]
+
+    monkeypatch.setattr(api.gc, "_may_match_patterns", record)
+    expected = annotations_of(api.correct(s))
+    assert decisions == [True]
+    assert code in [c for sent in expected for _, _, c in sent]
+    # Without the trigger lemma check, the annotations are the same
+    monkeypatch.setattr(api.gc, "_may_match_patterns", lambda sent: True)
+    assert annotations_of(api.correct(s)) == expected
@@ -0,0 +1,409 @@
+# type: ignore
+"""
+
+    test_wrappers.py
+
+    Tests for the high level API in the wrappers module
+
+    Copyright (C) 2022 by Miðeind ehf.
+
+    This software is licensed under the MIT License:
+
+        Permission is hereby granted, free of charge, to any person
+        obtaining a copy of this software and associated documentation
+        files (the "Software"), to deal in the Software without restriction,
+        including without limitation the rights to use, copy, modify, merge,
+        publish, distribute, sublicense, and/or sell copies of the Software,
+        and to permit persons to whom the Software is furnished to do so,
+        subject to the following conditions:
+
+        The above copyright notice and this permission notice shall be
+        included in all copies or substantial portions of the Software.
+
+        THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+        EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+        MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+        IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+        CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+        TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+        SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+    This module tests the GreynirCorrectAPI class and the
+    check_errors() and formatting functions of the wrappers module.
+
+"""
+
+import io
+import json
+
+import pytest
+from tokenizer import detokenize, tokenize
+
+from reynir_correct import Annotation, wrappers
+from reynir_correct.wrappers import (
+    CorrectedSentence,
+    CorrectionResult,
+    GreynirCorrectAPI,
+    check_errors,
+    format_json,
+    format_output,
+    fully_correct_sentence,
+)
+
+
+def test_api_reuse_keeps_option_values(monkeypatch) -> None:
+    """Check that reused API instances are created from the options
+    as given, and that the frozen options are only used as a key"""
+    created = []
+
+    def from_options(**options):
+        created.append(options)
+        return object()
+
+    monkeypatch.setattr(GreynirCorrectAPI, "from_options", staticmethod(from_options))
+    monkeypatch.setattr(wrappers, "_api_cache", wrappers.OrderedDict())
+    options = dict(tov_config=["extra.conf"], ignore_wordlist={"Jón"}, extra={"a": [1, 2]})
+    key, api = wrappers._get_api(options)
+    # An instance in use is not handed out to another caller
+    other_key, other = wrappers._get_api(dict(tov_config=["extra.conf"], ignore_wordlist={"Jón"}, extra={"a": [1, 2]}))
+    assert other_key == key
+    assert other is not api
+    wrappers._put_api(key, api)
+    assert wrappers._get_api(dict(tov_config=["extra.conf"], ignore_wordlist={"Jón"}, extra={"a": [1, 2]})) == (key, api)
+    assert len(created) == 2
+    assert created[0] == options
+    assert isinstance(created[0]["tov_config"], list)
+    assert isinstance(created[0]["ignore_wordlist"], set)
+    assert isinstance(created[0]["extra"], dict)
+    assert isinstance(created[0]["extra"]["a"], list)
+    # Changing the caller's options afterwards doesn't affect the instance's options
+    options["ignore_wordlist"].add("Gunna")
+    assert created[0]["ignore_wordlist"] == {"Jón"}
+    wrappers._put_api(key, api)
+    assert wrappers._get_api(options)[1] is not api
+    # Unhashable option values can't be frozen: a fresh instance, which isn't cached
+    assert wrappers._get_api(dict(extra=bytearray(b"x")))[0] is None
+
+
+class FakeAPI:
+    """Stands in for a GreynirCorrectAPI instance in check_errors()"""
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    def correct(self, text, **kwargs):
+        return wrappers.CorrectionResult(sentences=[])
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_check_errors_parallel_not_cached(monkeypatch) -> None:
+    """Instances with worker processes are closed after use, rather than cached"""
+    created = []
+
+    def from_options(**options):
+        created.append(FakeAPI())
+        return created[-1]
+
+    monkeypatch.setattr(GreynirCorrectAPI, "from_options", staticmethod(from_options))
+    monkeypatch.setattr(wrappers, "_api_cache", wrappers.OrderedDict())
+    check_errors(input="Halló.", n_process=2)
+    check_errors(input="Halló.", n_process=2)
+    assert len(created) == 2
+    assert all(api.closed for api in created)
+    assert not wrappers._api_cache
+    check_errors(input="Halló.")
+    check_errors(input="Halló.")
+    assert len(created) == 3
+    assert not created[2].closed
+    assert list(wrappers._api_cache.values()) == [[created[2]]]
+
+
+@pytest.mark.parametrize("ignore_wordlist", [{"Jón", "Gunna"}, ["Jón", "Gunna"]])
+def test_check_errors_reuse(ignore_wordlist) -> None:
+    """Check that repeated check_errors() calls, which reuse the API
+    instance, give the same output as a freshly created instance"""
+    text = f"Jón og Gunna komu heim. {SENTS[0]} {SENTS[1]}"
+    options = dict(ignore_wordlist=ignore_wordlist)
+    for _ in range(3):
+        fresh = format_output(GreynirCorrectAPI.from_options(**options).correct([text]), "json")
+        assert check_errors(input=text, format="json", **options) == fresh
+
+
+def test_readability_with_grammar_check() -> None:
+    """Check that the readability analyses, which run concurrently with the
+    grammar check, give the same results as without the grammar check"""
+    text = "Fundurinn var haldinn 1.–3. maí. Þar var rætt um fjárlagafrumvarpið – aftur."
+    with_grammar = GreynirCorrectAPI.from_options(flesch=True, rare_words=True).correct([text])
+    without_grammar = GreynirCorrectAPI.from_options(flesch=True, rare_words=True, all_errors=False).correct([text])
+    assert with_grammar.parse_result_stats is not None
+    assert with_grammar.flesch_result == without_grammar.flesch_result
+    assert with_grammar.rare_words == without_grammar.rare_words
+
+
+def annotations_of(result):
+    return [[(a.start, a.end, a.code, a.suggest) for a in s.annotations] for s in result.sentences]
+
+
+class FakeClassifier:
+    """A stand-in for SentenceClassifier that flags sentences containing
+    one of the given words, and records its calls"""
+
+    def __init__(self, *words: str) -> None:
+        self.words = words
+        self.calls = []
+
+    def classify_batch(self, sentences):
+        self.calls.append(list(sentences))
+        return [any(w in s for w in self.words) for s in sentences]
+
+
+@pytest.fixture(scope="module")
+def prefilter_api() -> GreynirCorrectAPI:
+    """Provide an API instance whose sentence prefilter is replaced by a fake"""
+    api = GreynirCorrectAPI.from_options()
+    yield api
+
+
+SENTS = [
+    "Hundurinn hans Páls fóru í bað í gær.",
+    "Þetta er rétt setning.",
+    "Allir kettirnir í götunni var að elta mýs.",
+    "Þessi setning er líka rétt.",
+]
+
+
+def test_prefilter_mixed(prefilter_api) -> None:
+    """Only the flagged sentences are parsed, in a single classification call,
+    and the sentences are returned in their original order"""
+    classifier = FakeClassifier("fóru", "elta")
+    prefilter_api.sentence_prefilter = classifier
+    text = " ".join(SENTS)
+    result = prefilter_api.correct([text])
+    assert len(classifier.calls) == 1
+    assert [s.strip() for s in classifier.calls[0]] == SENTS
+    assert [s.original_text.strip() for s in result.sentences] == SENTS
+    assert [s.parsed for s in result.sentences] == [True, False, True, False]
+    assert result.parse_result_stats.num_sentences == 2
+    assert "".join(s.original_text for s in result.sentences) == text
+
+
+def test_prefilter_matches_full_check(prefilter_api) -> None:
+    """The flagged sentences get the same annotations as in a full grammar check"""
+    text = " ".join(SENTS)
+    prefilter_api.sentence_prefilter = None
+    full = prefilter_api.correct([text])
+    prefilter_api.sentence_prefilter = FakeClassifier("fóru", "elta")
+    filtered = prefilter_api.correct([text])
+    for ix in (0, 2):
+        assert [(a.start, a.end, a.code) for a in filtered.sentences[ix].annotations] == [
+            (a.start, a.end, a.code) for a in full.sentences[ix].annotations
+        ]
+
+
+def test_prefilter_punctuation_sentence(prefilter_api) -> None:
+    """A sentence of only punctuation, which the parser skips, doesn't
+    shift the checked sentences out of their places"""
+    text = f"{SENTS[0]} !! ... {SENTS[1]} {SENTS[2]}"
+    prefilter_api.sentence_prefilter = None
+    full = prefilter_api.correct([text])
+    prefilter_api.sentence_prefilter = FakeClassifier("")
+    filtered = prefilter_api.correct([text])
+    assert all(s.parsed for s in filtered.sentences)
+    assert annotations_of(filtered) == annotations_of(full)
+
+
+def test_prefilter_all_correct(prefilter_api) -> None:
+    """Nothing is parsed if no sentence is flagged, and no tokens are lost"""
+    classifier = FakeClassifier()
+    prefilter_api.sentence_prefilter = classifier
+    text = " ".join(SENTS) + "  \n"
+    result = prefilter_api.correct([text])
+    assert len(classifier.calls) == 1
+    assert result.parse_result_stats is None
+    assert not any(s.parsed for s in result.sentences)
+    assert [s.original_text.strip() for s in result.sentences] == SENTS
+    all_tokens = list(prefilter_api._correct_spelling([text]))
+    assert sum(len(s.tokens) for s in result.sentences) == len(all_tokens)
+
+
+def test_parallel_grammar_check() -> None:
+    """Check that parsing in worker processes gives the same sentences
+    and annotations, in the same order, as parsing serially"""
+    text = " ".join(SENTS * 3)
+    api = GreynirCorrectAPI.from_options()
+    try:
+        serial = api.correct([text])
+        for _ in range(2):
+            # The second call reuses the pool of worker processes
+            parallel = api.correct([text], n_process=2)
+            assert [s.original_text for s in parallel.sentences] == [s.original_text for s in serial.sentences]
+            assert [s.parsed for s in parallel.sentences] == [s.parsed for s in serial.sentences]
+            assert [[(a.start, a.end, a.code, a.suggest) for a in s.annotations] for s in parallel.sentences] == [
+                [(a.start, a.end, a.code, a.suggest) for a in s.annotations] for s in serial.sentences
+            ]
+            stats, serial_stats = parallel.parse_result_stats, serial.parse_result_stats
+            assert stats.num_sentences == serial_stats.num_sentences
+            assert stats.num_parsed == serial_stats.num_parsed
+            assert stats.num_tokens == serial_stats.num_tokens
+    finally:
+        api.close()
+
+
+@pytest.fixture()
+def memo_api(monkeypatch) -> GreynirCorrectAPI:
+    """Provide a memoizing API instance that counts the token lists it parses"""
+    api = GreynirCorrectAPI.from_options(memoize=True)
+    api.parsed = []
+    correct_grammar = api._correct_grammar
+
+    def counting_correct_grammar(tokens):
+        text = "".join(t.original or "" for t in tokens).strip()
+        if text:
+            api.parsed.append(text)
+        return correct_grammar(tokens)
+
+    monkeypatch.setattr(api, "_correct_grammar", counting_correct_grammar)
+    yield api
+
+
+def test_memoize_hit_and_miss(memo_api) -> None:
+    """Repeated sentences are parsed once, with the same results"""
+    text = f"{SENTS[0]} {SENTS[2]} {SENTS[0]}"
+    result = memo_api.correct([text])
+    assert memo_api.parsed == [SENTS[0], SENTS[2]]
+    assert annotations_of(result)[0] == annotations_of(result)[2]
+    # A sentence from the cache has the original text of its own occurrence,
+    # including the whitespace preceding it
+    assert "".join(t.original or "" for sent in result.sentences for t in sent.tokens) == text
+    assert result.sentences[2].original_text == " " + SENTS[0]
+    again = memo_api.correct([text])
+    assert memo_api.parsed == [SENTS[0], SENTS[2]]
+    assert annotations_of(again) == annotations_of(result)
+    assert format_output(again, "json") == format_output(result, "json")
+    assert again.parse_result_stats.num_sentences == 3
+    assert again.parse_result_stats.parse_time == 0.0
+    # A different setting is a cache miss
+    memo_api.correct([text], ignore_rules={"P_NT_FjöldiHluti"})
+    assert memo_api.parsed == [SENTS[0], SENTS[2]] * 2
+
+
+def test_memoize_eviction(memo_api, monkeypatch) -> None:
+    """The least recently used sentence is evicted from a full cache"""
+    assert GreynirCorrectAPI._SENTENCE_CACHE_SIZE == 4096
+    memo_api.correct([SENTS[0]])
+    # Any token slice without text, after the sentence, has a cache entry of its own
+    monkeypatch.setattr(memo_api, "_SENTENCE_CACHE_SIZE", len(memo_api._sent_cache) + 1)
+    memo_api.correct([SENTS[1]])
+    # Use the first sentence, making the second one the least recently used
+    memo_api.correct([SENTS[0]])
+    memo_api.correct([SENTS[2]])
+    assert len(memo_api._sent_cache) == memo_api._SENTENCE_CACHE_SIZE
+    assert memo_api.parsed == [SENTS[0], SENTS[1], SENTS[2]]
+    memo_api.correct([SENTS[0]])
+    assert memo_api.parsed == [SENTS[0], SENTS[1], SENTS[2]]
+    memo_api.correct([SENTS[1]])
+    assert memo_api.parsed == [SENTS[0], SENTS[1], SENTS[2], SENTS[1]]
+
+
+def test_memoize_parallel() -> None:
+    """The sentence cache is used with parallel grammar checking as well"""
+    text = " ".join(SENTS + SENTS)
+    api = GreynirCorrectAPI.from_options(memoize=True)
+    try:
+        result = api.correct([text], n_process=2)
+        assert len(api._sent_cache) >= len(SENTS)
+        assert annotations_of(result) == annotations_of(GreynirCorrectAPI.from_options().correct([text]))
+        again = api.correct([text], n_process=2)
+        assert annotations_of(again) == annotations_of(result)
+        # Nothing was parsed
+        assert again.parse_result_stats.parse_time == 0.0
+    finally:
+        api.close()
+
+
+def test_memoize_caller_mutation(memo_api) -> None:
+    """Changes to returned results, after a miss or a hit, don't affect the cache"""
+
+    def mutate(result) -> None:
+        result.sentences[0].annotations.clear()
+        for t in result.sentences[0].tokens:
+            if t.txt == "Hundurinn":
+                t.txt = "Kötturinn"
+
+    # The first call is a miss, the later ones are hits
+    result = memo_api.correct([SENTS[0]])
+    expected = annotations_of(result)
+    assert expected[0]
+    mutate(result)
+    for _ in range(2):
+        result = memo_api.correct([SENTS[0]])
+        assert annotations_of(result) == expected
+        assert "Hundurinn" in [t.txt for t in result.sentences[0].tokens]
+        mutate(result)
+    assert memo_api.parsed == [SENTS[0]]
+
+
+@pytest.mark.parametrize("format", ["text", "json", "csv", "m2"])
+@pytest.mark.parametrize("all_errors", [True, False])
+def test_check_errors_output_stream(format, all_errors) -> None:
+    """Check that the output written to a stream is the same as the returned string"""
+    text = " ".join(SENTS)
+    options = dict(input=text, format=format, all_errors=all_errors, annotations=True, flesch=True)
+    returned = check_errors(**options)
+    output = io.StringIO()
+    assert check_errors(output=output, **options) == ""
+    assert output.getvalue() == returned
+
+
+def test_fully_correct_overlapping() -> None:
+    """Check overlapping annotations, and annotations starting at the same token"""
+    # Token indices: 0 is the sentence start token,
+    # 1 Okkur, 2 börnunum, 3 langar, 4 í, 5 fisk, 6 '.'
+    tokens = list(tokenize("Okkur börnunum langar í fisk."))
+    texts = [t.txt for t in tokens]
+    annotations = [
+        Annotation(2, 3, "Z001", "Skarast við fyrri villu", suggest="börnin vilja"),
+        Annotation(1, 2, "P_WRONG_CASE_þgf_nf", "Rangt fall", suggest="Við börnin"),
+        Annotation(5, 5, "S004", "Engin tillaga"),
+        Annotation(1, 1, "S001", "Stafsetning", suggest="Við"),
+    ]
+    original_order = list(annotations)
+    # The narrowest annotation starting at a token provides its text,
+    # and the spans of the other annotations are deleted
+    assert fully_correct_sentence(tokens, annotations) == "Við í fisk."
+    # Neither the tokens nor the caller's list of annotations are modified
+    assert [t.txt for t in tokens] == texts
+    assert annotations == original_order
+
+    result = CorrectionResult(sentences=[CorrectedSentence(tokens=tokens, parsed=False, annotations=annotations)])
+    d = json.loads(format_json(result))
+    assert d["corrected"] == "Við í fisk."
+    # The texts of the word and punctuation tokens in the JSON output are the
+    # original ones. The output omits a token at the end for each token without
+    # an original text, such as the sentence start and end tokens.
+    assert [t["x"] for t in d["tokens"] if t["x"]] == [t.txt for t in tokens if t.original]
+    assert [t["x"] for t in d["tokens"] if t["x"]] == ["Okkur", "börnunum", "langar", "í", "fisk", "."]
+    assert [(a["start"], a["end"]) for a in d["annotations"]] == [(2, 3), (1, 2), (5, 5), (1, 1)]
+    assert annotations == original_order
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Okkur börnunum langar í fisk.",
+        'Hann sagði  "halló"  , og fór  ... 3 - 4 .',
+        "Ég keypti 3 kg af eplum á 1.500 kr. ( með vsk. ) !",
+    ],
+)
+def test_fully_correct_without_suggestions(text) -> None:
+    """Check that a sentence without annotations to apply has the
+    same text as when its tokens are substituted one by one"""
+    tokens = list(tokenize(text))
+    expected = detokenize(tokens)
+    assert fully_correct_sentence(tokens, []) == expected
+    assert fully_correct_sentence(tokens, [Annotation(1, 2, "S004", "Engin tillaga")]) == expected
+    # Substituting a token's own text goes through the token by token path
+    assert fully_correct_sentence(tokens, [Annotation(1, 1, "S001", "Sama texti", suggest=tokens[1].txt)]) == expected